@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Task, Comment
+from .search import full_text_enabled, search_tasks, search_comments
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
@@ -7,8 +8,19 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ('priority', 'status')
     search_fields = ('title', 'description')
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the GIN-indexed search vector instead of icontains scans
+        if search_term and full_text_enabled():
+            return search_tasks(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('task', 'user', 'timestamp')
     search_fields = ('content',)
-    list_filter = ('timestamp',)
\ No newline at end of file
+    list_filter = ('timestamp',)
+
+    def get_search_results(self, request, queryset, search_term):
+        if search_term and full_text_enabled():
+            return search_comments(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
\ No newline at end of file
@@ -0,0 +1,175 @@
+"""
+Native async variants of the Task and Comment list, retrieve and create
+endpoints, served under ``/api/async/``.
+
+Under ASGI, Django runs each sync view in a thread of its own, so every
+request in flight holds a thread for its whole duration, and concurrency
+is bounded by the thread pool. These views run on the event loop instead
+and use a thread only while a query runs (Django's async ORM still runs
+each query in one): ``KeysetCursorPagination.apaginate_queryset`` fetches pages with
+``aiterator``, single objects are loaded with ``aget`` and new ones saved
+with ``acreate``. The JWT is authenticated with
+``CachedJWTCookieAuthentication.aauthenticate``.
+
+Everything else is borrowed from the sync viewsets, through an instance
+configured for the action: queryset and prefetches, filter backends,
+serializers and pagination. Responses have the same shape as the sync
+endpoints, including the ``{"message": ..., "data": ...}`` envelope on
+create and the versioned response cache on task reads.
+
+Serializer validation may query the database (e.g. the ``task`` of a new
+comment), so it still runs through ``sync_to_async``. With
+``REQUEST_METRICS`` enabled its sync-only middleware brings the thread hop
+back for every request.
+"""
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import caching
+from .authentication import CachedJWTCookieAuthentication
+from .views import TaskViewSet, CommentViewSet
+
+authenticator = CachedJWTCookieAuthentication()
+
+
+def json_response(data, status=status.HTTP_200_OK, headers=None):
+    return JsonResponse(data, status=status, headers=headers, encoder=JSONEncoder, safe=False)
+
+
+def error_response(exc):
+    """Render an APIException like DRF's default exception handler."""
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    return json_response(data, exc.status_code, headers)
+
+
+async def aget_object(viewset):
+    """Async ``GenericAPIView.get_object``."""
+    queryset = viewset.filter_queryset(viewset.get_queryset())
+    lookup_url_kwarg = viewset.lookup_url_kwarg or viewset.lookup_field
+    try:
+        instance = await queryset.aget(**{viewset.lookup_field: viewset.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+        raise exceptions.NotFound(f'No {queryset.model._meta.object_name} matches the given query.')
+    viewset.check_object_permissions(viewset.request, instance)
+    return instance
+
+
+class AsyncViewSetView(View):
+    """
+    Base class of the async endpoints: authenticates the request and hands
+    each handler a ``viewset_class`` instance set up for the action.
+    """
+
+    viewset_class = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Like DRF views, authentication is by token, not session cookie
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            result = await authenticator.aauthenticate(request)
+            if result is None:
+                raise exceptions.NotAuthenticated()
+            request.user = result[0]
+            return await super().dispatch(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            return error_response(exc)
+
+    def get_viewset(self, request, action):
+        drf_request = Request(request, parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+        drf_request.user = request.user
+        viewset = self.viewset_class(
+            request=drf_request, args=self.args, kwargs=self.kwargs, action=action, format_kwarg=None,
+        )
+        viewset.check_permissions(drf_request)
+        return viewset
+
+    async def list_payload(self, viewset):
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        paginator = viewset.paginator
+        page = await paginator.apaginate_queryset(queryset, viewset.request, view=viewset)
+        serializer = viewset.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+    async def retrieve_payload(self, viewset):
+        return viewset.get_serializer(await aget_object(viewset)).data
+
+    async def create_response(self, viewset, message, **extra):
+        serializer = viewset.get_serializer(data=viewset.request.data)
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+        model = serializer.Meta.model
+        instance = await model._default_manager.acreate(**serializer.validated_data, **extra)
+        instance = await self.created_instance(viewset, instance)
+        return json_response(
+            {'message': message, 'data': viewset.get_serializer(instance).data},
+            status=status.HTTP_201_CREATED,
+        )
+
+    async def created_instance(self, viewset, instance):
+        """Return ``instance`` ready to be serialized without further queries."""
+        return instance
+
+
+class AsyncTaskListView(AsyncViewSetView):
+    viewset_class = TaskViewSet
+
+    async def get(self, request):
+        viewset = self.get_viewset(request, 'list')
+        entry = await caching.alist_entry(request)
+        return await caching.acached_response(request, entry, lambda: self.list_payload(viewset))
+
+    async def post(self, request):
+        return await self.create_response(self.get_viewset(request, 'create'), 'Task is successfully created')
+
+    async def created_instance(self, viewset, instance):
+        # Load the assignees and recent comments the detail serializer renders
+        return await viewset.get_queryset().aget(pk=instance.pk)
+
+
+class AsyncTaskDetailView(AsyncViewSetView):
+    viewset_class = TaskViewSet
+
+    async def get(self, request, pk):
+        viewset = self.get_viewset(request, 'retrieve')
+        task_id = caching.lookup_task_id(pk)
+        if task_id is None:
+            # Not a task id: answer the 404 without caching anything
+            return json_response(await self.retrieve_payload(viewset))
+        entry = await caching.adetail_entry(task_id)
+        return await caching.acached_response(request, entry, lambda: self.retrieve_payload(viewset))
+
+
+class AsyncCommentListView(AsyncViewSetView):
+    viewset_class = CommentViewSet
+
+    async def get(self, request):
+        return json_response(await self.list_payload(self.get_viewset(request, 'list')))
+
+    async def post(self, request):
+        return await self.create_response(
+            self.get_viewset(request, 'create'), 'Comment is successfully created', user=request.user,
+        )
+
+    async def created_instance(self, viewset, instance):
+        # Load the author's profile the serializer renders
+        return await viewset.get_queryset().aget(pk=instance.pk)
+
+
+class AsyncCommentDetailView(AsyncViewSetView):
+    viewset_class = CommentViewSet
+
+    async def get(self, request, pk):
+        return json_response(await self.retrieve_payload(self.get_viewset(request, 'retrieve')))
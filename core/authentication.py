@@ -0,0 +1,212 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.utils.translation import gettext_lazy as _
+from dj_rest_auth.app_settings import api_settings as rest_auth_settings
+from dj_rest_auth.jwt_auth import JWTCookieAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import hashing
+
+USER_CACHE_DEFAULTS = {
+    'MAX_SIZE': 1024,
+    'TTL': 30,
+}
+
+
+class UserCache:
+    """
+    Thread-safe, size-bounded LRU of User objects with a time-to-live.
+
+    Entries are dropped from ``core/signals.py`` when a user or its profile
+    is saved or deleted. Those signals only reach the current process, so the
+    TTL bounds how long another worker may keep serving a stale user.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _config(self):
+        return {**USER_CACHE_DEFAULTS, **getattr(settings, 'JWT_USER_CACHE', {})}
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+
+    def set(self, user_id, user):
+        config = self._config()
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + config['TTL'], user)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > config['MAX_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+user_cache = UserCache()
+
+
+class CachedJWTCookieAuthentication(JWTCookieAuthentication):
+    """
+    JWT header/cookie authentication that resolves the token's user (and its
+    UserProfile) through the in-process ``user_cache`` instead of querying
+    the database on every request.
+
+    The active-user and revoked-token checks still run on every request.
+    Configure the cache with the ``JWT_USER_CACHE`` setting
+    (``MAX_SIZE``, ``TTL`` in seconds).
+    """
+
+    def get_user(self, validated_token):
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related('userprofile').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, user)
+        return self.checked_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        """``get_user`` loading a cache miss through the async ORM."""
+        user_id = self.get_user_id(validated_token)
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = await self.user_model.objects.select_related('userprofile').aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, user)
+        return self.checked_user(user, validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        ``authenticate`` for the async views in ``core/async_views.py``, which
+        receive a plain HttpRequest. Token validation is CPU only; the user
+        lookup on a cache miss is the one awaited query.
+        """
+        header = self.get_header(request)
+        if header is None:
+            cookie_name = rest_auth_settings.JWT_AUTH_COOKIE
+            if not cookie_name:
+                return None
+            raw_token = request.COOKIES.get(cookie_name)
+            if rest_auth_settings.JWT_AUTH_COOKIE_ENFORCE_CSRF_ON_UNAUTHENTICATED:
+                self.enforce_csrf(request)
+            elif raw_token is not None and rest_auth_settings.JWT_AUTH_COOKIE_USE_CSRF:
+                self.enforce_csrf(request)
+        else:
+            raw_token = self.get_raw_token(header)
+
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+    def checked_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        # Requests get their own copy so per-request changes never leak into the cache
+        return copy.copy(user)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords on the bounded hashing pool
+    (``core.hashing``) instead of the request thread.
+
+    ``check_credentials``/``acheck_credentials`` raise ``HashingPoolFull``
+    when the pool is saturated, for views that answer 503. Through
+    ``authenticate()`` it is a PermissionDenied instead, which ends the
+    attempt as a failed login, so callers such as the admin never see an
+    error.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        try:
+            return self.check_credentials(username or kwargs.get(get_user_model().USERNAME_FIELD), password)
+        except hashing.HashingPoolFull:
+            raise PermissionDenied
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        try:
+            return await self.acheck_credentials(username or kwargs.get(get_user_model().USERNAME_FIELD), password)
+        except hashing.HashingPoolFull:
+            raise PermissionDenied
+
+    def check_credentials(self, username, password):
+        """Return the active user with these credentials, or None."""
+        if username is None or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so response times don't reveal which usernames exist
+            hashing.make_password(password)
+            return None
+        if hashing.check_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def acheck_credentials(self, username, password):
+        """Async ``check_credentials``."""
+        if username is None or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await hashing.amake_password(password)
+            return None
+        if await hashing.acheck_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,137 @@
+"""
+Background thumbnail pipeline for ``UserProfile.avatar``.
+
+When a profile's avatar changes, ``schedule`` queues it (after the
+transaction commits) on a small thread pool that renders square,
+fixed-size variants in every configured format with Pillow and stores them
+next to the original. The storage paths are saved in
+``UserProfile.avatar_variants`` as ``{"small": {"webp": ..., "jpeg": ...}}``.
+``UserSerializer`` exposes them as URLs, so listings can reference small
+files instead of the full-size upload.
+
+Configure with the ``AVATAR_VARIANTS`` setting (see AVATAR_DEFAULTS).
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from .authentication import user_cache
+from .caching import invalidate_tasks
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+AVATAR_DEFAULTS = {
+    # Variant name -> edge length in pixels
+    'SIZES': {'small': 32, 'medium': 64, 'large': 128},
+    'FORMATS': ['webp', 'jpeg'],
+    'QUALITY': 80,
+    # Threads rendering variants
+    'WORKERS': 2,
+}
+
+PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def avatar_config():
+    return {**AVATAR_DEFAULTS, **getattr(settings, 'AVATAR_VARIANTS', {})}
+
+
+def get_executor():
+    """Return the process-wide worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=avatar_config()['WORKERS'], thread_name_prefix='avatar'
+                )
+    return _executor
+
+
+def variant_paths(variants):
+    return [path for formats in variants.values() for path in formats.values()]
+
+
+def schedule(profile_id, stale=()):
+    """
+    Render the profile's avatar variants in the background once the current
+    transaction commits, then delete the ``stale`` variant files.
+    """
+    stale = list(stale)
+    transaction.on_commit(lambda: get_executor().submit(run_in_worker, profile_id, stale))
+
+
+def run_in_worker(profile_id, stale=()):
+    """Executor entry point: ``process`` the profile, then close the thread's connections."""
+    try:
+        process(profile_id, stale)
+    finally:
+        # Worker threads live outside the request cycle that closes connections
+        connections.close_all()
+
+
+def process(profile_id, stale=()):
+    """Render the variants and delete the ``stale`` files, logging failures."""
+    try:
+        for path in stale:
+            default_storage.delete(path)
+        generate_variants(profile_id)
+    except Exception:
+        logger.exception('Failed to render avatar variants for profile %s', profile_id)
+
+
+def render(image, size, file_format, quality):
+    """Return ``image`` cropped to a centered square of ``size`` pixels, encoded."""
+    thumbnail = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+    buffer = BytesIO()
+    thumbnail.save(buffer, PIL_FORMATS[file_format], quality=quality)
+    return buffer.getvalue()
+
+
+def generate_variants(profile_id):
+    """
+    Render and store every variant of the profile's current avatar and
+    record them on the profile. Return the variants, or None when the
+    profile has no avatar or it was replaced while rendering.
+    """
+    profile = UserProfile.objects.filter(pk=profile_id).first()
+    if profile is None or not profile.avatar:
+        return None
+    config = avatar_config()
+    name = profile.avatar.name
+
+    with profile.avatar.open('rb') as original:
+        image = ImageOps.exif_transpose(Image.open(original))
+        image = image.convert('RGB')
+
+    stem = os.path.splitext(os.path.basename(name))[0]
+    variants = {}
+    for label, size in config['SIZES'].items():
+        variants[label] = {}
+        for file_format in config['FORMATS']:
+            path = f'avatars/variants/{profile.user_id}/{stem}_{size}.{file_format}'
+            content = ContentFile(render(image, size, file_format, config['QUALITY']))
+            variants[label][file_format] = default_storage.save(path, content)
+
+    # Only record the variants if the avatar is still the one that was rendered
+    if not UserProfile.objects.filter(pk=profile_id, avatar=name).update(avatar_variants=variants):
+        for path in variant_paths(variants):
+            default_storage.delete(path)
+        return None
+
+    user_cache.invalidate(profile.user_id)
+    invalidate_tasks(profile.user.tasks.values_list('pk', flat=True))
+    return variants
@@ -0,0 +1,55 @@
+"""
+Benchmarks for the task manager.
+
+Every benchmark module can be run directly, e.g.
+``python -m core.benchmarks.bulk_tasks``. They run against a throwaway test
+database created from the configured ``DATABASES`` settings, so they never
+touch real data.
+"""
+
+import contextlib
+import os
+import time
+
+
+def setup_django():
+    """Configure Django when a benchmark is run as a script."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'taskmanager.settings')
+    import django
+    django.setup()
+
+
+@contextlib.contextmanager
+def benchmark_database(verbosity=0):
+    """Create a test database for the duration of the block."""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def authenticated_client(user):
+    """Return an APIClient carrying a JWT access token for ``user``."""
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+    return client
+
+
+@contextlib.contextmanager
+def timed(results, name):
+    """Store the wall-clock seconds spent in the block as ``results[name]``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        results[name] = time.perf_counter() - started
@@ -0,0 +1,132 @@
+"""
+Sync DRF views versus the native async views in ``core/async_views.py``.
+
+Drives the ASGI application in-process with N concurrent clients per run,
+for each concurrency level, and reports throughput and latency
+percentiles of task list, task detail and comment create on both code
+paths. The response cache is cleared between requests unless
+``--warm-cache`` is given, so reads reach the database.
+
+Usage: python -m core.benchmarks.async_views [--concurrency 1,10,50] [--requests 50] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from core.benchmarks import benchmark_database, setup_django
+from core.benchmarks.suite import PERCENTILES, percentile, seed
+
+PREFIXES = {'sync': '/api/', 'async': '/api/async/'}
+
+
+def scenarios(task_ids):
+    return {
+        'task_list': lambda rng, i: ('GET', 'tasks/', None),
+        'task_detail': lambda rng, i: ('GET', f'tasks/{rng.choice(task_ids)}/', None),
+        'comment_create': lambda rng, i: ('POST', 'comments/', {
+            'task': rng.choice(task_ids), 'content': f'Benchmark comment {i}',
+        }),
+    }
+
+
+async def client(application, rng, token, prefix, request, requests, cold_cache, results):
+    from channels.testing import HttpCommunicator
+    from django.core.cache import cache
+
+    headers = [
+        # 'testserver' is allowed by the test environment the throwaway database sets up
+        (b'host', b'testserver'),
+        (b'authorization', f'Bearer {token}'.encode()),
+        (b'content-type', b'application/json'),
+    ]
+    for iteration in range(requests):
+        if cold_cache:
+            await cache.aclear()
+        method, path, body = request(rng, iteration)
+        body = json.dumps(body).encode() if body else b''
+        communicator = HttpCommunicator(
+            application, method, prefix + path, body=body,
+            headers=headers + [(b'content-length', str(len(body)).encode())],
+        )
+        started = time.perf_counter()
+        response = await communicator.get_response(timeout=120)
+        results.append((time.perf_counter() - started, response['status']))
+        # Let the handler finish its disconnect listener before dropping the communicator
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=120)
+
+
+async def run_level(application, rng, token, prefix, request, concurrency, requests, cold_cache):
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(application, random.Random(rng.random()), token, prefix, request, requests, cold_cache, results)
+        for _ in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    latencies = [latency for latency, _ in results]
+    summary = {f'p{percent}_ms': percentile(latencies, percent) * 1000 for percent in PERCENTILES}
+    summary.update({
+        'requests': len(results),
+        'errors': sum(1 for _, status in results if status >= 400),
+        'requests_per_second': len(results) / elapsed,
+    })
+    return summary
+
+
+def run(rng, token, task_ids, levels, requests, cold_cache):
+    from taskmanager.asgi import application
+
+    results = {}
+    for name, request in scenarios(task_ids).items():
+        for mode, prefix in PREFIXES.items():
+            results.setdefault(name, {})[mode] = {
+                str(level): asyncio.run(run_level(application, rng, token, prefix, request, level, requests, cold_cache))
+                for level in levels
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--tasks', type=int, default=1000)
+    parser.add_argument('--comments', type=int, default=5000)
+    parser.add_argument('--concurrency', default='1,10,50', help='comma separated numbers of concurrent clients')
+    parser.add_argument('--requests', type=int, default=50, help='requests per client and run')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the response cache between requests')
+    parser.add_argument('--output', help='also write the results as JSON to this file')
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    setup_django()
+    from django.conf import settings
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+    rng = random.Random(args.seed)
+    with benchmark_database():
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        user, task_ids, _ = seed(rng, args.users, args.tasks, args.comments, assignees=2)
+        token = str(RefreshToken.for_user(user).access_token)
+        results = run(rng, token, task_ids, levels, args.requests, not args.warm_cache)
+
+    for name, modes in results.items():
+        for mode, by_level in modes.items():
+            for level, metrics in by_level.items():
+                print(
+                    f'{name:>15} {mode:>5} x{level:<4}: {metrics["requests_per_second"]:8.1f} req/s  '
+                    f'p50 {metrics["p50_ms"]:8.2f}ms  p99 {metrics["p99_ms"]:8.2f}ms  {metrics["errors"]} errors'
+                )
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(results, output, indent=2)
+        print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare creating tasks through ``/api/tasks/bulk/`` against one POST per task.
+
+Usage: python -m core.benchmarks.bulk_tasks [--count N] [--assignees K]
+"""
+
+import argparse
+
+from core.benchmarks import authenticated_client, benchmark_database, setup_django, timed
+
+
+def task_payload(index, user_ids):
+    return {
+        'title': f'Benchmark task {index}',
+        'description': 'Created by the bulk benchmark',
+        'status': 'Not Started',
+        'priority': 'Medium',
+        'assigned_users': user_ids,
+    }
+
+
+def run(count, assignees):
+    from django.contrib.auth.models import User
+    from core.models import Task
+
+    users = [User.objects.create_user(username=f'bench{i}', password='benchpass') for i in range(max(assignees, 1))]
+    user_ids = [user.pk for user in users[:assignees]]
+    client = authenticated_client(users[0])
+    results = {}
+
+    with timed(results, 'individual'):
+        for index in range(count):
+            response = client.post('/api/tasks/', task_payload(index, []), format='json')
+            assert response.status_code == 201, response.data
+            # TaskSerializer exposes assigned_users read-only, so assignment is a separate write
+            task = Task.objects.get(pk=response.data['data']['id'])
+            task.assigned_users.add(*user_ids)
+
+    with timed(results, 'bulk'):
+        response = client.post('/api/tasks/bulk/', [task_payload(i, user_ids) for i in range(count)], format='json')
+        assert response.status_code == 201, response.data
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=500, help='number of tasks per run (max 1000)')
+    parser.add_argument('--assignees', type=int, default=2, help='assigned users per task')
+    args = parser.parse_args()
+
+    setup_django()
+    with benchmark_database():
+        results = run(args.count, args.assignees)
+
+    for name, seconds in results.items():
+        print(f'{name:>10}: {seconds:8.3f}s  {args.count / seconds:10.1f} tasks/s')
+    print(f'{"speedup":>10}: {results["individual"] / results["bulk"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Fan-out throughput of TaskConsumer broadcasts on the in-memory channel layer.
+
+Compares group messages carrying a ``message`` dict, which every subscriber
+encodes itself, with pre-encoded ``text`` payloads (``core.events.task_event``),
+which are encoded once by the publisher.
+
+Usage: python -m core.benchmarks.fanout [--subscribers N] [--messages M]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from core.benchmarks import setup_django
+
+
+def sample_payload(index):
+    return {
+        'event': 'task_changed',
+        'task_id': 1,
+        'task': 'updated',
+        'comments': {'added': list(range(index, index + 20))},
+        'note': 'x' * 512,
+    }
+
+
+async def connect_subscribers(application, count):
+    from channels.testing import WebsocketCommunicator
+
+    communicators = [WebsocketCommunicator(application, '/ws/task/1/') for _ in range(count)]
+    for communicator in communicators:
+        connected, _ = await communicator.connect()
+        assert connected
+    return communicators
+
+
+async def drain(communicator, expected):
+    received = 0
+    while received < expected:
+        frame = json.loads(await communicator.receive_from(timeout=30))
+        received += len(frame) if isinstance(frame, list) else 1
+
+
+async def run_mode(application, mode, subscribers, messages):
+    from channels.layers import get_channel_layer
+    from core import codec
+    from core.events import task_event
+
+    layer = get_channel_layer()
+    communicators = await connect_subscribers(application, subscribers)
+    started = time.perf_counter()
+    for index in range(messages):
+        payload = sample_payload(index)
+        if mode == 'encode-once':
+            event = task_event(1, codec.dumps(payload))
+        else:
+            event = {'type': 'task_update', 'task_id': 1, 'message': payload}
+        await layer.group_send('task_1', event)
+    await asyncio.gather(*(drain(communicator, messages) for communicator in communicators))
+    elapsed = time.perf_counter() - started
+    for communicator in communicators:
+        await communicator.disconnect()
+    return elapsed
+
+
+async def run(subscribers, messages):
+    from channels.routing import URLRouter
+    from core.routing import websocket_urlpatterns
+
+    application = URLRouter(websocket_urlpatterns)
+    return {
+        mode: await run_mode(application, mode, subscribers, messages)
+        for mode in ('per-subscriber', 'encode-once')
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--subscribers', type=int, default=200)
+    parser.add_argument('--messages', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+    results = asyncio.run(run(args.subscribers, args.messages))
+    deliveries = args.subscribers * args.messages
+    for mode, seconds in results.items():
+        print(f'{mode:>15}: {seconds:8.3f}s  {deliveries / seconds:10.0f} deliveries/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Reproducible benchmark suite for the REST API and WebSocket fan-out.
+
+Seeds a throwaway database with a configurable, seeded-random volume of
+users, tasks, comments and assignments, then measures:
+
+* latency percentiles and SQL query counts of list, detail and create for
+  ``TaskViewSet`` and ``CommentViewSet`` (through the full middleware stack);
+* ``TaskConsumer`` fan-out throughput with N subscribers on the in-memory
+  channel layer.
+
+Results are written as JSON; pass a previous result file as ``--baseline``
+to print the relative change of every metric.
+
+Usage: python -m core.benchmarks.suite [--tasks N] [--output results.json] [--baseline old.json]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+from core.benchmarks import authenticated_client, benchmark_database, setup_django
+
+PERCENTILES = (50, 90, 99)
+
+
+def percentile(samples, percent):
+    """Nearest-rank percentile of a non-empty list of samples."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies, queries):
+    summary = {f'p{percent}_ms': percentile(latencies, percent) * 1000 for percent in PERCENTILES}
+    summary.update({
+        'mean_ms': statistics.fmean(latencies) * 1000,
+        'max_ms': max(latencies) * 1000,
+        'requests': len(latencies),
+        'queries_mean': statistics.fmean(queries),
+        'queries_max': max(queries),
+    })
+    return summary
+
+
+def seed(rng, users, tasks, comments, assignees):
+    """Bulk-insert the benchmark data set and return (user, task ids, comment ids)."""
+    from django.contrib.auth.models import User
+    from core import stats
+    from core.bulk import BATCH_SIZE, bulk_create_users
+    from core.models import Task, Comment
+
+    accounts = []
+    for index in range(users):
+        account = User(username=f'bench{index}', email=f'bench{index}@example.com')
+        account.set_unusable_password()
+        accounts.append(account)
+    user_ids = [account.pk for account in bulk_create_users(accounts)]
+
+    statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+    priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+    created = Task.objects.bulk_create([
+        Task(
+            title=f'Benchmark task {index}',
+            description=' '.join(rng.choice(('alpha', 'beta', 'gamma', 'delta')) for _ in range(20)),
+            status=rng.choice(statuses),
+            priority=rng.choice(priorities),
+        )
+        for index in range(tasks)
+    ], batch_size=BATCH_SIZE)
+    task_ids = [task.pk for task in created]
+
+    Task.assigned_users.through.objects.bulk_create([
+        Task.assigned_users.through(task_id=task_id, user_id=user_id)
+        for task_id in task_ids
+        for user_id in rng.sample(user_ids, min(assignees, len(user_ids)))
+    ], batch_size=BATCH_SIZE)
+    Comment.objects.bulk_create([
+        Comment(task_id=rng.choice(task_ids), user_id=rng.choice(user_ids), content=f'Benchmark comment {index}')
+        for index in range(comments)
+    ], batch_size=BATCH_SIZE)
+
+    # The bulk inserts above bypass the denormalized counters
+    Task.objects.refresh_activity()
+    stats.rebuild()
+
+    comment_ids = list(Comment.objects.values_list('pk', flat=True))
+    return User.objects.get(pk=user_ids[0]), task_ids, comment_ids
+
+
+def measure(client, requests, request, cold_cache):
+    """Issue ``request(client, iteration)`` ``requests`` times; return the summary."""
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    latencies, queries = [], []
+    for iteration in range(requests):
+        if cold_cache:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            started = time.perf_counter()
+            response = request(client, iteration)
+            latencies.append(time.perf_counter() - started)
+        assert response.status_code < 300, (response.status_code, getattr(response, 'data', None))
+        queries.append(len(context))
+    return summarize(latencies, queries)
+
+
+def http_scenarios(rng, task_ids, comment_ids):
+    def pick(ids):
+        return ids[rng.randrange(len(ids))]
+
+    return {
+        'task_list': lambda client, i: client.get('/api/tasks/'),
+        'task_detail': lambda client, i: client.get(f'/api/tasks/{pick(task_ids)}/'),
+        'task_create': lambda client, i: client.post('/api/tasks/', {
+            'title': f'Created task {i}', 'description': 'benchmark', 'status': 'Not Started', 'priority': 'Low',
+        }, format='json'),
+        'comment_list': lambda client, i: client.get('/api/comments/'),
+        'comment_detail': lambda client, i: client.get(f'/api/comments/{pick(comment_ids)}/'),
+        'comment_create': lambda client, i: client.post('/api/comments/', {
+            'task': pick(task_ids), 'content': f'Created comment {i}',
+        }, format='json'),
+    }
+
+
+def run_http(rng, user, task_ids, comment_ids, requests, warmup, cold_cache):
+    client = authenticated_client(user)
+    results = {}
+    for name, request in http_scenarios(rng, task_ids, comment_ids).items():
+        for iteration in range(warmup):
+            request(client, -1 - iteration)
+        results[name] = measure(client, requests, request, cold_cache)
+    return results
+
+
+def run_fanout(subscribers, messages):
+    from channels.routing import URLRouter
+    from core.benchmarks.fanout import run_mode
+    from core.routing import websocket_urlpatterns
+
+    elapsed = asyncio.run(run_mode(URLRouter(websocket_urlpatterns), 'encode-once', subscribers, messages))
+    deliveries = subscribers * messages
+    return {
+        'subscribers': subscribers,
+        'messages': messages,
+        'seconds': elapsed,
+        'deliveries_per_second': deliveries / elapsed,
+    }
+
+
+def metadata(args):
+    import django
+    from django.db import connection
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'parameters': {
+            name: getattr(args, name)
+            for name in ('seed', 'users', 'tasks', 'comments', 'assignees', 'requests', 'warmup',
+                         'warm_cache', 'subscribers', 'messages')
+        },
+    }
+
+
+def compare(baseline, results):
+    """Print the relative change of every numeric metric against ``baseline``."""
+    for section in ('http', 'websocket'):
+        for name, metrics in results.get(section, {}).items():
+            old_metrics = baseline.get(section, {}).get(name, {})
+            for metric, value in metrics.items():
+                old = old_metrics.get(metric)
+                if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                    print(f'{section}.{name}.{metric}: {old:.3f} -> {value:.3f} ({(value - old) / old:+.1%})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seed', type=int, default=1, help='random seed for the data set and requests')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--tasks', type=int, default=2000)
+    parser.add_argument('--comments', type=int, default=10000)
+    parser.add_argument('--assignees', type=int, default=2, help='assigned users per task')
+    parser.add_argument('--requests', type=int, default=200, help='measured requests per scenario')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests per scenario')
+    parser.add_argument('--warm-cache', action='store_true', help='keep the response cache between requests')
+    parser.add_argument('--subscribers', type=int, default=200, help='WebSocket subscribers for fan-out')
+    parser.add_argument('--messages', type=int, default=50, help='messages broadcast for fan-out')
+    parser.add_argument('--output', default='benchmark-results.json')
+    parser.add_argument('--baseline', help='previous result file to compare against')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+
+    rng = random.Random(args.seed)
+    with benchmark_database():
+        user, task_ids, comment_ids = seed(rng, args.users, args.tasks, args.comments, args.assignees)
+        results = {
+            'meta': metadata(args),
+            'http': run_http(rng, user, task_ids, comment_ids, args.requests, args.warmup, not args.warm_cache),
+            'websocket': {'fanout': run_fanout(args.subscribers, args.messages)},
+        }
+
+    with open(args.output, 'w') as output:
+        json.dump(results, output, indent=2)
+
+    for name, metrics in results['http'].items():
+        print(
+            f'{name:>15}: p50 {metrics["p50_ms"]:7.2f}ms  p90 {metrics["p90_ms"]:7.2f}ms  '
+            f'p99 {metrics["p99_ms"]:7.2f}ms  {metrics["queries_mean"]:5.1f} queries'
+        )
+    fanout = results['websocket']['fanout']
+    print(f'{"fanout":>15}: {fanout["deliveries_per_second"]:10.0f} deliveries/s')
+    print(f'Results written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            compare(json.load(baseline), results)
+
+
+if __name__ == '__main__':
+    main()
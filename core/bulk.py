@@ -0,0 +1,172 @@
+"""
+Batched task writes for the ``/api/tasks/bulk/`` endpoint.
+
+Each operation validates every item first and reports per-item errors
+without writing anything; otherwise all rows are written in one transaction
+(a ``sync.bounded_write``, so it fails with ``WriteTooSlow`` if it runs long)
+with ``bulk_create``/``bulk_update`` and batched inserts into the
+``assigned_users`` through table. Bulk writes skip per-row ``post_save``
+signals, so ``tasks_bulk_changed`` is sent once for the whole batch instead
+and the dashboard counts (``core/stats.py``) are adjusted here.
+Deletes still go through the per-row delete signals.
+"""
+
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.utils import timezone
+
+from . import stats, sync
+from .models import Task, UserProfile
+from .serializers import TaskBulkItemSerializer
+from .signals import tasks_bulk_changed
+
+MAX_BULK_ITEMS = 1000
+BATCH_SIZE = 500
+
+Assignment = Task.assigned_users.through
+
+
+class BulkValidationError(Exception):
+    """Raised with the per-item errors of an invalid bulk request."""
+
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def _validate(items, partial):
+    if not isinstance(items, list) or not items:
+        raise BulkValidationError([{'index': None, 'errors': {'non_field_errors': ['Expected a non-empty list of items.']}}])
+    if len(items) > MAX_BULK_ITEMS:
+        raise BulkValidationError([{'index': None, 'errors': {'non_field_errors': [f'At most {MAX_BULK_ITEMS} items are allowed.']}}])
+
+    errors = []
+    validated = []
+    for index, item in enumerate(items):
+        serializer = TaskBulkItemSerializer(data=item, partial=partial)
+        if serializer.is_valid():
+            data = serializer.validated_data
+            if partial and 'id' not in data:
+                errors.append({'index': index, 'errors': {'id': ['This field is required.']}})
+            validated.append(data)
+        else:
+            errors.append({'index': index, 'errors': serializer.errors})
+            validated.append(None)
+
+    # Check every referenced user with a single query
+    user_ids = {user_id for data in validated if data for user_id in data.get('assigned_users', [])}
+    existing = set(User.objects.filter(pk__in=user_ids).values_list('pk', flat=True))
+    for index, data in enumerate(validated):
+        missing = [user_id for user_id in (data or {}).get('assigned_users', []) if user_id not in existing]
+        if missing:
+            errors.append({'index': index, 'errors': {
+                'assigned_users': [f'Invalid pk "{user_id}" - object does not exist.' for user_id in missing]
+            }})
+
+    if errors:
+        raise BulkValidationError(sorted(errors, key=lambda error: error['index']))
+    return validated
+
+
+def _assignments(pairs):
+    return [Assignment(task_id=task_id, user_id=user_id) for task_id, user_id in pairs]
+
+
+def bulk_create_tasks(items):
+    """Create tasks and their assignments; return the new task ids in input order."""
+    validated = _validate(items, partial=False)
+
+    with sync.bounded_write():
+        tasks = Task.objects.bulk_create(
+            [Task(**{k: v for k, v in data.items() if k not in ('id', 'assigned_users')}) for data in validated],
+            batch_size=BATCH_SIZE,
+        )
+        # New tasks have had no activity yet; the field default would differ from created_at
+        Task.objects.filter(pk__in=[task.pk for task in tasks]).update(last_activity_at=F('created_at'))
+        pairs = {
+            (task.pk, user_id)
+            for task, data in zip(tasks, validated)
+            for user_id in data.get('assigned_users', [])
+        }
+        Assignment.objects.bulk_create(_assignments(pairs), batch_size=BATCH_SIZE)
+
+        keys = Counter()
+        for data in validated:
+            keys.update(stats.task_keys(data['status'], data['priority'], set(data.get('assigned_users', []))))
+        stats.apply_deltas(keys)
+
+        task_ids = [task.pk for task in tasks]
+        tasks_bulk_changed.send(sender=Task, task_ids=task_ids, action='create')
+    return task_ids
+
+
+def bulk_update_tasks(items):
+    """
+    Partially update tasks. A provided ``assigned_users`` list replaces the
+    task's current assignees. Return the updated task ids.
+    """
+    validated = _validate(items, partial=True)
+
+    with sync.bounded_write():
+        tasks = Task.objects.select_for_update().in_bulk([data['id'] for data in validated])
+        missing = [
+            {'index': index, 'errors': {'id': ['Task not found.']}}
+            for index, data in enumerate(validated) if data['id'] not in tasks
+        ]
+        if missing:
+            raise BulkValidationError(missing)
+        before = stats.snapshot(list(tasks))
+
+        fields = set()
+        reassigned = {}
+        for data in validated:
+            task = tasks[data['id']]
+            for name, value in data.items():
+                if name == 'assigned_users':
+                    reassigned[task.pk] = value
+                elif name != 'id':
+                    setattr(task, name, value)
+                    fields.add(name)
+
+        # bulk_update() skips auto_now; reassigned tasks have changed as well
+        now = timezone.now()
+        for task in tasks.values():
+            task.updated_at = now
+        Task.objects.bulk_update(list(tasks.values()), sorted(fields | {'updated_at'}), batch_size=BATCH_SIZE)
+        if reassigned:
+            Assignment.objects.filter(task_id__in=reassigned).delete()
+            pairs = {(task_id, user_id) for task_id, user_ids in reassigned.items() for user_id in user_ids}
+            Assignment.objects.bulk_create(_assignments(pairs), batch_size=BATCH_SIZE)
+        stats.apply_deltas(stats.diff(before, stats.snapshot(list(tasks))))
+
+        task_ids = list(tasks)
+        tasks_bulk_changed.send(sender=Task, task_ids=task_ids, action='update')
+    return task_ids
+
+
+def bulk_delete_tasks(ids):
+    """Delete the tasks with the given ids; return the ids that existed."""
+    if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+        raise BulkValidationError([{'index': None, 'errors': {'ids': ['Expected a list of task ids.']}}])
+    if len(ids) > MAX_BULK_ITEMS:
+        raise BulkValidationError([{'index': None, 'errors': {'ids': [f'At most {MAX_BULK_ITEMS} ids are allowed.']}}])
+
+    with sync.bounded_write():
+        task_ids = list(Task.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        Task.objects.filter(pk__in=task_ids).delete()
+        tasks_bulk_changed.send(sender=Task, task_ids=task_ids, action='delete')
+    return task_ids
+
+
+def bulk_create_users(users, batch_size=BATCH_SIZE):
+    """
+    Insert unsaved User instances together with their UserProfile rows.
+
+    This is the batched equivalent of saving each user and letting the
+    ``create_profile`` signal insert its profile. Return the saved users.
+    """
+    users = User.objects.bulk_create(users, batch_size=batch_size)
+    UserProfile.objects.bulk_create([UserProfile(user=user) for user in users], batch_size=batch_size)
+    return users
@@ -0,0 +1,156 @@
+"""
+Versioned response cache for task reads.
+
+Every task has a version token in the cache, and so does the task list as
+a whole. Cached responses and ETags are keyed on those tokens, so bumping a
+token from the model signals in ``core/signals.py`` invalidates every
+dependent entry at once without tracking or deleting individual keys.
+Tokens are random rather than counters, so an evicted version can never
+collide with one a client still holds in ``If-None-Match``.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponseNotModified, JsonResponse
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+LIST_VERSION_KEY = 'tasks:list:version'
+
+
+def task_cache_timeout():
+    return getattr(settings, 'TASK_CACHE_TIMEOUT', 300)
+
+
+def _version_key(task_id):
+    return f'tasks:{task_id}:version'
+
+
+def _new_token():
+    return uuid.uuid4().hex[:12]
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _new_token(), None)
+        version = cache.get(key)
+    return version
+
+
+async def _aget_version(key):
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, _new_token(), None)
+        version = await cache.aget(key)
+    return version
+
+
+def _bump(task_ids):
+    versions = {_version_key(task_id): _new_token() for task_id in task_ids}
+    versions[LIST_VERSION_KEY] = _new_token()
+    cache.set_many(versions, None)
+
+
+def invalidate_tasks(task_ids):
+    """
+    Invalidate cached responses for the given tasks and for the task list.
+
+    The versions are bumped immediately and again once the surrounding
+    transaction commits, so a read racing the write cannot store
+    pre-commit data under the post-commit version.
+    """
+    task_ids = {task_id for task_id in task_ids if task_id is not None}
+    _bump(task_ids)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(task_ids))
+
+
+def _detail_entry(task_id, version):
+    return f'tasks:detail:{task_id}:{version}', f'"t{task_id}-{version}"'
+
+
+def _list_entry(request, version):
+    digest = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+    return f'tasks:list:{version}:{digest}', f'"l{version}-{digest[:12]}"'
+
+
+def lookup_task_id(value):
+    """
+    Return the task pk a URL lookup resolves to, or None if it can't name
+    a task. Entries must be keyed on it: ``/api/tasks/007/`` is task 7, and
+    only task 7's version is bumped when it changes.
+    """
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def detail_entry(task_id):
+    """Return the (cache key, ETag) pair for a task detail response."""
+    return _detail_entry(task_id, _get_version(_version_key(task_id)))
+
+
+async def adetail_entry(task_id):
+    """Async ``detail_entry``; the key is shared with the sync views."""
+    return _detail_entry(task_id, await _aget_version(_version_key(task_id)))
+
+
+def list_entry(request):
+    """Return the (cache key, ETag) pair for a task list response."""
+    return _list_entry(request, _get_version(LIST_VERSION_KEY))
+
+
+async def alist_entry(request):
+    """Async ``list_entry``."""
+    return _list_entry(request, await _aget_version(LIST_VERSION_KEY))
+
+
+def cached_response(request, entry, render):
+    """
+    Serve a read from the versioned cache.
+
+    Answers ``If-None-Match`` with 304 before touching the database,
+    returns the cached payload on a hit, and otherwise calls ``render`` and
+    caches successful responses.
+    """
+    key, etag = entry
+    headers = {'ETag': etag}
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    data = cache.get(key)
+    if data is not None:
+        return Response(data, headers=headers)
+
+    response = render()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(key, response.data, task_cache_timeout())
+        response['ETag'] = etag
+    return response
+
+
+async def acached_response(request, entry, render):
+    """
+    ``cached_response`` for the async views: ``render`` is a coroutine
+    function returning the payload of a 200 response.
+    """
+    key, etag = entry
+    headers = {'ETag': etag}
+
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        return HttpResponseNotModified(headers=headers)
+
+    data = await cache.aget(key)
+    if data is None:
+        data = await render()
+        await cache.aset(key, data, task_cache_timeout())
+    return JsonResponse(data, encoder=JSONEncoder, headers=headers)
@@ -0,0 +1,64 @@
+"""
+Pluggable JSON codec for WebSocket payloads.
+
+Select it with the ``TASK_JSON_CODEC`` setting: ``"json"`` (the default,
+standard library), ``"orjson"`` (requires the optional ``orjson`` package)
+or the dotted path of a module exposing ``dumps(obj) -> str`` and
+``loads(text)``.
+"""
+
+import importlib
+import json
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+
+class StdlibCodec:
+    @staticmethod
+    def dumps(obj):
+        return json.dumps(obj, separators=(',', ':'))
+
+    loads = staticmethod(json.loads)
+
+
+class OrjsonCodec:
+    def __init__(self):
+        try:
+            import orjson
+        except ImportError:
+            raise ImproperlyConfigured("TASK_JSON_CODEC is 'orjson' but the orjson package is not installed.")
+        self._orjson = orjson
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj).decode()
+
+    def loads(self, text):
+        return self._orjson.loads(text)
+
+
+_codecs = {}
+
+
+def get_codec():
+    name = getattr(settings, 'TASK_JSON_CODEC', 'json')
+    codec = _codecs.get(name)
+    if codec is None:
+        if name == 'json':
+            codec = StdlibCodec()
+        elif name == 'orjson':
+            codec = OrjsonCodec()
+        else:
+            codec = importlib.import_module(name)
+            if not (hasattr(codec, 'dumps') and hasattr(codec, 'loads')):
+                raise ImproperlyConfigured(f"TASK_JSON_CODEC module {name!r} must define dumps and loads.")
+        _codecs[name] = codec
+    return codec
+
+
+def dumps(obj):
+    return get_codec().dumps(obj)
+
+
+def loads(text):
+    return get_codec().loads(text)
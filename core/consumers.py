@@ -1,11 +1,134 @@
+import asyncio
 import json
+from collections import deque
+from urllib.parse import parse_qs
+
 from channels.generic.websocket import AsyncWebsocketConsumer
+from django.conf import settings
+
+from . import codec, eventlog
+from .events import group_name, task_event
+
+OUTBOUND_DEFAULTS = {
+    # Seconds to wait for more messages before flushing a partial batch
+    'FLUSH_INTERVAL': 0.005,
+    # Messages per frame; a full batch is flushed immediately
+    'MAX_BATCH': 50,
+    # Messages queued per connection before the overflow policy applies
+    # (does not limit what the server buffers for a slow reader)
+    'MAX_QUEUE': 1000,
+    # 'drop_oldest', 'resync' or 'disconnect'
+    'OVERFLOW': 'drop_oldest',
+}
+
+RESYNC_FRAME = '{"event":"resync"}'
+
+# Close code sent when a client is disconnected for falling behind
+CLOSE_TRY_AGAIN_LATER = 1013
 
+DEFAULT_MAX_SUBSCRIPTIONS = 500
 
-class TaskConsumer(AsyncWebsocketConsumer):
+
+def event_text(event):
+    """
+    Return the encoded payload of a ``task_update`` group message.
+
+    Publishers send pre-encoded ``text`` (see ``core.events.task_event``);
+    messages carrying a plain ``message`` dict are encoded here.
+    """
+    text = event.get('text')
+    return text if text is not None else codec.dumps(event['message'])
+
+
+class BufferedSendMixin:
+    """
+    Per-connection outbound buffer for WebSocket consumers.
+
+    ``queue_send`` appends a pre-encoded JSON text to a bounded queue that a
+    background task flushes every ``FLUSH_INTERVAL`` seconds, or as soon as
+    ``MAX_BATCH`` messages are waiting. A flush with a single message sends it
+    as-is; several messages are sent as one JSON array frame. When the queue
+    reaches ``MAX_QUEUE``, the ``OVERFLOW`` policy either drops the oldest
+    message, replaces the backlog with a ``resync`` event telling the client
+    to refetch, or closes the connection.
+
+    This bounds the queue only, and only against publish bursts that outpace
+    the flush task. ``send`` returns as soon as the server (e.g. daphne) has
+    taken the frame into its write buffer, however slowly the client reads,
+    so the queue drains regardless and a slow reader's backlog grows in the
+    server's buffer instead. Memory held for slow readers is not bounded.
+
+    Configure with the ``TASK_WS_OUTBOUND`` setting (see OUTBOUND_DEFAULTS).
+    """
+
+    def start_outbound(self):
+        self.outbound_config = {**OUTBOUND_DEFAULTS, **getattr(settings, 'TASK_WS_OUTBOUND', {})}
+        self.outbound = deque()
+        self.outbound_ready = asyncio.Event()
+        self.outbound_full = asyncio.Event()
+        self.outbound_dropped = 0
+        self.outbound_task = asyncio.ensure_future(self.flush_outbound())
+
+    def stop_outbound(self):
+        task = getattr(self, 'outbound_task', None)
+        if task is not None:
+            task.cancel()
+            self.outbound_task = None
+
+    async def queue_send(self, text):
+        config = self.outbound_config
+        if len(self.outbound) >= config['MAX_QUEUE']:
+            self.outbound_dropped += 1
+            policy = config['OVERFLOW']
+            if policy == 'disconnect':
+                self.outbound.clear()
+                self.stop_outbound()
+                await self.close(code=CLOSE_TRY_AGAIN_LATER)
+                return
+            if policy == 'resync':
+                self.outbound.clear()
+                self.outbound.append(RESYNC_FRAME)
+            else:
+                self.outbound.popleft()
+
+        self.outbound.append(text)
+        self.outbound_ready.set()
+        if len(self.outbound) >= config['MAX_BATCH']:
+            self.outbound_full.set()
+
+    async def flush_outbound(self):
+        config = self.outbound_config
+        while True:
+            await self.outbound_ready.wait()
+            if len(self.outbound) < config['MAX_BATCH']:
+                try:
+                    await asyncio.wait_for(self.outbound_full.wait(), config['FLUSH_INTERVAL'])
+                except asyncio.TimeoutError:
+                    pass
+            self.outbound_full.clear()
+
+            batch = [self.outbound.popleft() for _ in range(min(len(self.outbound), config['MAX_BATCH']))]
+            if not self.outbound:
+                self.outbound_ready.clear()
+            if len(batch) == 1:
+                await self.send(text_data=batch[0])
+            elif batch:
+                await self.send(text_data='[' + ','.join(batch) + ']')
+
+
+class TaskConsumer(BufferedSendMixin, AsyncWebsocketConsumer):
     """
     WebSocket consumer to handle real-time task updates.
     Clients connect to a specific task's group to receive and send updates.
+    Outgoing group messages are batched per connection (see BufferedSendMixin).
+
+    Every message carries a per-task ``seq`` number. A reconnecting client
+    can connect with ``?last_seq=<n>`` (or send
+    ``{"action": "resume", "last_seq": <n>}``) to receive only the events it
+    missed. If they are no longer available it gets
+    ``{"event": "resync", "seq": <current>}`` and should refetch the task.
+    Replayed and live events may overlap, so clients ignore any seq they have
+    already seen.
     """
 
     async def connect(self):
@@ -14,40 +137,142 @@ class TaskConsumer(AsyncWebsocketConsumer):
         Joins a group based on the task ID.
         """
         self.task_id = self.scope['url_route']['kwargs']['task_id']
-        self.group_name = f"task_{self.task_id}"
+        self.group_name = group_name(self.task_id)
 
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
+        self.start_outbound()
+
+        last_seq = parse_qs(self.scope.get('query_string', b'').decode()).get('last_seq', [''])[0]
+        if last_seq.isdigit():
+            await self.resume(int(last_seq))
 
     async def disconnect(self, close_code):
         """
         Called when the WebSocket connection is closed.
         Leaves the task group.
         """
+        self.stop_outbound()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
+    async def resume(self, last_seq):
+        """
+        Replay the logged events after ``last_seq``, or ask for a resync.
+        """
+        events = await eventlog.asince(self.task_id, last_seq)
+        if events is None:
+            current = await eventlog.acurrent_seq(self.task_id)
+            await self.queue_send(codec.dumps({"event": "resync", "seq": current}))
+            return
+        for text in events:
+            await self.queue_send(text)
+
     async def receive(self, text_data):
         """
         Called when a message is received from the WebSocket.
         Broadcasts the message to the task group.
         """
         try:
-            data = json.loads(text_data)
-        except json.JSONDecodeError:
+            data = codec.loads(text_data)
+        except ValueError:
             await self.send(text_data=json.dumps({"error": "Invalid JSON format"}))
             return
 
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                'type': 'task_update',
-                'message': data
-            }
-        )
+        if isinstance(data, dict) and data.get('action') == 'resume':
+            last_seq = data.get('last_seq')
+            if isinstance(last_seq, int) and not isinstance(last_seq, bool) and last_seq >= 0:
+                await self.resume(last_seq)
+            else:
+                await self.queue_send(codec.dumps({"error": "last_seq must be a non-negative integer"}))
+            return
+
+        # Stamped with the next sequence number and encoded once for all subscribers
+        text = await eventlog.aappend(self.task_id, data)
+        await self.channel_layer.group_send(self.group_name, task_event(int(self.task_id), text))
 
     async def task_update(self, event):
         """
         Called when a message is received from the group.
-        Forwards the message to the WebSocket client.
+        Queues the message for the WebSocket client.
+        """
+        await self.queue_send(event_text(event))
+
+
+class TaskMultiplexConsumer(BufferedSendMixin, AsyncWebsocketConsumer):
+    """
+    WebSocket consumer that follows many tasks over a single connection.
+
+    Clients send ``{"action": "subscribe", "task_ids": [1, 2]}`` or
+    ``{"action": "unsubscribe", "task_ids": [2]}``; updates for every
+    subscribed task arrive on the connection's one channel as
+    ``{"task_id": 1, "message": {...}}``. The number of subscriptions per
+    connection is capped by the ``TASK_WS_MAX_SUBSCRIPTIONS`` setting.
+    """
+
+    async def connect(self):
+        """
+        Called when the WebSocket connection is established.
+        """
+        self.subscriptions = set()
+        self.max_subscriptions = getattr(settings, 'TASK_WS_MAX_SUBSCRIPTIONS', DEFAULT_MAX_SUBSCRIPTIONS)
+        await self.accept()
+        self.start_outbound()
+
+    async def disconnect(self, close_code):
+        """
+        Called when the WebSocket connection is closed.
+        Leaves every subscribed task group.
+        """
+        self.stop_outbound()
+        await self.update_groups(self.channel_layer.group_discard, self.subscriptions)
+        self.subscriptions = set()
+
+    async def update_groups(self, operation, task_ids):
+        await asyncio.gather(*(operation(group_name(task_id), self.channel_name) for task_id in task_ids))
+
+    async def reply(self, data):
+        await self.queue_send(codec.dumps(data))
+
+    async def receive(self, text_data):
+        """
+        Called when a message is received from the WebSocket.
+        Handles subscribe and unsubscribe requests.
+        """
+        try:
+            data = codec.loads(text_data)
+        except ValueError:
+            await self.reply({"error": "Invalid JSON format"})
+            return
+
+        action = data.get('action') if isinstance(data, dict) else None
+        task_ids = data.get('task_ids') if isinstance(data, dict) else None
+        if action not in ('subscribe', 'unsubscribe'):
+            await self.reply({"error": "Unknown action, expected subscribe or unsubscribe"})
+            return
+        if not isinstance(task_ids, list) or not all(
+            isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids
+        ):
+            await self.reply({"error": "task_ids must be a list of task ids"})
+            return
+
+        if action == 'subscribe':
+            added = set(task_ids) - self.subscriptions
+            if len(self.subscriptions) + len(added) > self.max_subscriptions:
+                await self.reply({"error": f"Subscription limit of {self.max_subscriptions} tasks exceeded"})
+                return
+            await self.update_groups(self.channel_layer.group_add, added)
+            self.subscriptions |= added
+        else:
+            removed = set(task_ids) & self.subscriptions
+            await self.update_groups(self.channel_layer.group_discard, removed)
+            self.subscriptions -= removed
+
+        await self.reply({"event": "subscriptions", "task_ids": sorted(self.subscriptions)})
+
+    async def task_update(self, event):
+        """
+        Called when a message is received from one of the subscribed groups.
+        Queues it for the client together with its task id.
         """
-        await self.send(text_data=json.dumps(event['message']))
+        # Splice the pre-encoded payload into the envelope instead of re-encoding it
+        await self.queue_send('{"task_id":%s,"message":%s}' % (json.dumps(event.get('task_id')), event_text(event)))
@@ -0,0 +1,94 @@
+"""
+Bounded per-task log of recent WebSocket events, for resuming clients.
+
+Every event published to a ``task_<id>`` group gets the next value of a
+per-task sequence number, stored in the payload as ``"seq"``, and is kept in
+a ring buffer of ``TASK_EVENT_LOG_SIZE`` slots in the Django cache. A
+reconnecting client passes the last sequence number it saw and receives
+only the events after it, or ``None`` when part of that range has already
+been evicted and a full refetch is required.
+
+The log lives in the default cache, so deployments with several worker
+processes need a shared backend (the settings configure Redis) for the
+numbering and resume to work across workers.
+
+The counter is a cache entry too, and may be evicted. A new counter starts
+from the current time in microseconds, not from 1, so numbering stays
+increasing across the reset (unless a task had more than one event per
+microsecond), and a client resuming from before it is asked to resync
+instead of being handed the wrong events.
+"""
+
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+from . import codec
+
+
+def log_size():
+    return getattr(settings, 'TASK_EVENT_LOG_SIZE', 256)
+
+
+def log_timeout():
+    return getattr(settings, 'TASK_EVENT_LOG_TIMEOUT', 3600)
+
+
+def _seq_key(task_id):
+    return f'tasks:{task_id}:events:seq'
+
+
+def _slot_key(task_id, seq):
+    return f'tasks:{task_id}:events:{seq % log_size()}'
+
+
+def current_seq(task_id):
+    """Return the sequence number of the last event logged for the task."""
+    return cache.get(_seq_key(task_id), 0)
+
+
+def append(task_id, payload):
+    """
+    Stamp ``payload`` with the task's next sequence number, store it in the
+    ring buffer and return the encoded text to publish.
+
+    Non-dict payloads are wrapped as ``{"seq": ..., "data": payload}``.
+    """
+    cache.add(_seq_key(task_id), time.time_ns() // 1000, None)
+    seq = cache.incr(_seq_key(task_id))
+    if isinstance(payload, dict):
+        text = codec.dumps({**payload, 'seq': seq})
+    else:
+        text = codec.dumps({'seq': seq, 'data': payload})
+    cache.set(_slot_key(task_id, seq), (seq, text), log_timeout())
+    return text
+
+
+def since(task_id, last_seq):
+    """
+    Return the encoded events logged after ``last_seq``, oldest first, or
+    None when some of them are no longer in the buffer.
+    """
+    current = current_seq(task_id)
+    if last_seq == current:
+        return []
+    # Also covers a last_seq from before the counter was reset
+    if last_seq > current or current - last_seq > log_size():
+        return None
+
+    wanted = range(last_seq + 1, current + 1)
+    entries = cache.get_many([_slot_key(task_id, seq) for seq in wanted])
+    events = []
+    for seq in wanted:
+        entry = entries.get(_slot_key(task_id, seq))
+        if entry is None or entry[0] != seq:
+            return None
+        events.append(entry[1])
+    return events
+
+
+aappend = sync_to_async(append)
+asince = sync_to_async(since)
+acurrent_seq = sync_to_async(current_seq)
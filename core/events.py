@@ -0,0 +1,139 @@
+"""
+Server-originated change events for the task WebSocket groups.
+
+Model signals (see ``core/signals.py``) call ``record_change`` for every
+write. Changes are queued once the database transaction commits, merged per
+task for ``TASK_EVENTS_COALESCE_SECONDS`` and then published as a single
+compact ``task_changed`` event to the ``task_<id>`` group, e.g.::
+
+    {"event": "task_changed", "task_id": 7, "task": "updated",
+     "assignees": true, "comments": {"added": [41], "deleted": [12]}}
+
+Only keys with changes are present. Clients refetch whatever they display.
+Each event also carries the task's next ``seq`` number (see ``core.eventlog``).
+"""
+
+import logging
+import threading
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.db import transaction
+
+from . import eventlog
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = {}
+_timer = None
+
+
+def group_name(task_id):
+    return f"task_{task_id}"
+
+
+def task_event(task_id, text):
+    """
+    Build the group message for an already encoded payload.
+
+    The payload is serialized once by the publisher and every subscribed
+    consumer forwards ``text`` verbatim instead of re-encoding it.
+    """
+    return {'type': 'task_update', 'task_id': task_id, 'text': text}
+
+
+def coalesce_seconds():
+    return getattr(settings, 'TASK_EVENTS_COALESCE_SECONDS', 0.05)
+
+
+def record_change(task_id, task=None, assignees=False, comments=None):
+    """
+    Record a change to a task, to be published after the current transaction
+    commits (immediately when not in a transaction).
+
+    Args:
+        task: 'created', 'updated' or 'deleted' for changes to the task row.
+        assignees: True when the assigned users changed.
+        comments: mapping of 'added' / 'edited' / 'deleted' to comment ids.
+    """
+    change = {'task': task, 'assignees': assignees, 'comments': comments or {}}
+    transaction.on_commit(lambda: _enqueue(task_id, change))
+
+
+def _merge(event, change):
+    if change['task'] == 'deleted' or event.get('task') == 'deleted':
+        event['task'] = 'deleted'
+    elif change['task'] and event.get('task') != 'created':
+        event['task'] = change['task']
+
+    if change['assignees']:
+        event['assignees'] = True
+
+    comments = event.setdefault('comments', {})
+    for kind in ('added', 'edited', 'deleted'):
+        for comment_id in change['comments'].get(kind, ()):
+            if kind == 'deleted':
+                was_added = comment_id in comments.get('added', ())
+                for earlier in ('added', 'edited'):
+                    if comment_id in comments.get(earlier, ()):
+                        comments[earlier].remove(comment_id)
+                if was_added:
+                    continue
+            elif kind == 'edited' and comment_id in comments.get('added', ()):
+                continue
+            ids = comments.setdefault(kind, [])
+            if comment_id not in ids:
+                ids.append(comment_id)
+
+
+def _payload(task_id, event):
+    payload = {'event': 'task_changed', 'task_id': task_id}
+    if event.get('task'):
+        payload['task'] = event['task']
+    if event.get('assignees') and event.get('task') != 'deleted':
+        payload['assignees'] = True
+    comments = {kind: ids for kind, ids in event.get('comments', {}).items() if ids}
+    if comments and event.get('task') != 'deleted':
+        payload['comments'] = comments
+    return payload
+
+
+def _enqueue(task_id, change):
+    global _timer
+    with _lock:
+        _merge(_pending.setdefault(task_id, {}), change)
+        window = coalesce_seconds()
+        if window > 0:
+            if _timer is None:
+                _timer = threading.Timer(window, flush)
+                _timer.daemon = True
+                _timer.start()
+            return
+    flush()
+
+
+def flush():
+    """Publish every pending change event now."""
+    global _timer
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+        _timer = None
+
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    for task_id, event in pending.items():
+        payload = _payload(task_id, event)
+        if len(payload) == 2:
+            continue  # Changes cancelled out, e.g. a comment added and deleted
+        try:
+            async_to_sync(channel_layer.group_send)(
+                group_name(task_id), task_event(task_id, eventlog.append(task_id, payload))
+            )
+        except Exception:
+            logger.exception("Failed to publish change event for task %s", task_id)
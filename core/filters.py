@@ -0,0 +1,113 @@
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+from .models import Task
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Server-side filtering for the Task list.
+
+    Supported query parameters:
+        status, priority  -- one or more comma separated choice values
+        assignee          -- id of an assigned user
+        created_after     -- ISO date or datetime, inclusive
+        created_before    -- ISO date or datetime, exclusive
+
+    The status/priority/created_at combinations are backed by the composite
+    indexes declared on ``Task.Meta``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        for name, choices in (('status', Task.STATUS_CHOICES), ('priority', Task.PRIORITY_CHOICES)):
+            if name not in params:
+                continue
+            values = [value.strip() for value in params[name].split(',') if value.strip()]
+            allowed = {choice for choice, _ in choices}
+            invalid = [value for value in values if value not in allowed]
+            if invalid:
+                errors[name] = [f'Invalid choice: {value}' for value in invalid]
+            elif values:
+                queryset = queryset.filter(**{f'{name}__in': values})
+
+        assignee = params.get('assignee')
+        if assignee is not None:
+            if assignee.isdigit():
+                queryset = queryset.filter(assigned_users__id=int(assignee))
+            else:
+                errors['assignee'] = ['Expected a user id.']
+
+        for name, lookup in (('created_after', 'created_at__gte'), ('created_before', 'created_at__lt')):
+            if name not in params:
+                continue
+            value = self.parse_moment(params[name])
+            if value is None:
+                errors[name] = ['Expected an ISO 8601 date or datetime.']
+            else:
+                queryset = queryset.filter(**{lookup: value})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+    @staticmethod
+    def parse_moment(value):
+        try:
+            return parse_datetime(value) or parse_date(value)
+        except ValueError:
+            return None
+
+
+class CommentFilterBackend(BaseFilterBackend):
+    """
+    Server-side filtering for comments.
+
+    Supported query parameters:
+        task, user        -- id of the task / author
+        created_after     -- ISO date or datetime, inclusive
+        created_before    -- ISO date or datetime, exclusive
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        errors = {}
+
+        for name in ('task', 'user'):
+            value = params.get(name)
+            if value is None:
+                continue
+            if value.isdigit():
+                queryset = queryset.filter(**{f'{name}_id': int(value)})
+            else:
+                errors[name] = [f'Expected a {name} id.']
+
+        for name, lookup in (('created_after', 'timestamp__gte'), ('created_before', 'timestamp__lt')):
+            if name not in params:
+                continue
+            value = TaskFilterBackend.parse_moment(params[name])
+            if value is None:
+                errors[name] = ['Expected an ISO 8601 date or datetime.']
+            else:
+                queryset = queryset.filter(**{lookup: value})
+
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+
+class TaskOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that appends an id tiebreaker in the same direction as
+    the requested field, so cursor pagination stays deterministic.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering or ordering[-1].lstrip('-') in ('id', 'pk'):
+            return ordering
+        tiebreaker = '-id' if ordering[0].startswith('-') else 'id'
+        return list(ordering) + [tiebreaker]
@@ -0,0 +1,108 @@
+"""
+GitHub OAuth client used by the ``auth/github/`` view.
+
+Requests go through one shared ``requests.Session`` whose connection pool
+keeps TLS connections to GitHub alive between logins, always with connect
+and read timeouts. The blocking calls run in a worker thread via the
+``a``-prefixed wrappers so an async view never blocks the event loop;
+``thread_sensitive=False`` runs them on the shared executor rather than
+the request's own sync thread, which they don't need. User profiles
+are cached briefly in the Django cache, keyed by a hash of the access token.
+
+Configure with the ``GITHUB_HTTP`` setting (see GITHUB_DEFAULTS).
+"""
+
+import hashlib
+import threading
+
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+
+GITHUB_DEFAULTS = {
+    'TOKEN_URL': 'https://github.com/login/oauth/access_token',
+    'USER_URL': 'https://api.github.com/user',
+    # Seconds to establish a connection / to wait for a response
+    'CONNECT_TIMEOUT': 3.05,
+    'READ_TIMEOUT': 10,
+    # Connections kept open per host
+    'POOL_SIZE': 10,
+    # Seconds a fetched profile is reused
+    'PROFILE_CACHE_TIMEOUT': 60,
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class GitHubError(Exception):
+    """A failed GitHub call, with the HTTP status to answer the client with."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def github_config():
+    return {**GITHUB_DEFAULTS, **getattr(settings, 'GITHUB_HTTP', {})}
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                size = github_config()['POOL_SIZE']
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=size, pool_maxsize=size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def _request(method, url, **kwargs):
+    config = github_config()
+    try:
+        response = get_session().request(
+            method, url, timeout=(config['CONNECT_TIMEOUT'], config['READ_TIMEOUT']), **kwargs
+        )
+        return response.json()
+    except requests.Timeout:
+        raise GitHubError('GitHub did not respond in time', status=504)
+    except requests.RequestException:
+        raise GitHubError('GitHub is unavailable', status=502)
+    except ValueError:
+        raise GitHubError('Unexpected response from GitHub', status=502)
+
+
+def exchange_code(code):
+    """Exchange an OAuth authorization code for an access token."""
+    data = _request('POST', github_config()['TOKEN_URL'], data={
+        'client_id': settings.GITHUB_CLIENT_ID,
+        'client_secret': settings.GITHUB_CLIENT_SECRET,
+        'code': code,
+    }, headers={'Accept': 'application/json'})
+    access_token = data.get('access_token') if isinstance(data, dict) else None
+    if not access_token:
+        raise GitHubError('Failed to get access token')
+    return access_token
+
+
+def fetch_profile(access_token):
+    """Return the GitHub user profile for ``access_token``, cached briefly."""
+    key = 'github:profile:' + hashlib.sha256(access_token.encode()).hexdigest()
+    profile = cache.get(key)
+    if profile is None:
+        profile = _request('GET', github_config()['USER_URL'], headers={'Authorization': f'token {access_token}'})
+        if not isinstance(profile, dict) or 'id' not in profile:
+            raise GitHubError('Failed to fetch user info')
+        cache.set(key, profile, github_config()['PROFILE_CACHE_TIMEOUT'])
+    return profile
+
+
+aexchange_code = sync_to_async(exchange_code, thread_sensitive=False)
+afetch_profile = sync_to_async(fetch_profile, thread_sensitive=False)
@@ -0,0 +1,161 @@
+"""
+Bounded worker pool for password hashing and verification.
+
+PBKDF2 takes tens of milliseconds of CPU per call. Registration and login
+hash through ``pool`` instead of inline: at most ``WORKERS`` hashes run at a
+time, and once ``MAX_QUEUE`` calls are queued or running, new ones fail fast
+with ``HashingPoolFull`` (answered with 503 by the views) instead of piling
+up behind a login burst. ``pool.stats()`` reports the queue depth, peak,
+rejections and the time spent waiting and hashing.
+
+The login and registration views are async and await the ``a``-prefixed
+functions. Under ASGI each sync view runs in a thread of its own, which
+would sit idle for as long as its hash is queued (up to ``TIMEOUT``), so
+a burst of logins would hold one thread per waiting request; an awaiting
+view holds none.
+
+Configure with the ``PASSWORD_HASHING`` setting (see HASHING_DEFAULTS).
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+logger = logging.getLogger(__name__)
+
+HASHING_DEFAULTS = {
+    # Hashes computed in parallel
+    'WORKERS': 4,
+    # Calls queued or running before new ones are rejected
+    'MAX_QUEUE': 64,
+    # Seconds a caller waits for its result
+    'TIMEOUT': 10,
+}
+
+
+class HashingPoolFull(Exception):
+    """Raised when the hashing queue is at its depth limit."""
+
+
+def hashing_config():
+    return {**HASHING_DEFAULTS, **getattr(settings, 'PASSWORD_HASHING', {})}
+
+
+class HashingPool:
+    """Thread pool with a queue-depth limit and counters."""
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.depth = 0
+            self.peak_depth = 0
+            self.completed = 0
+            self.rejected = 0
+            self.wait_time = 0.0
+            self.hash_time = 0.0
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=hashing_config()['WORKERS'], thread_name_prefix='hashing'
+            )
+        return self._executor
+
+    def submit(self, fn, *args):
+        """Queue ``fn(*args)``; return its future or raise HashingPoolFull."""
+        limit = hashing_config()['MAX_QUEUE']
+        with self._lock:
+            if self.depth >= limit:
+                self.rejected += 1
+                logger.warning('Password hashing queue is full (%s calls), rejecting', limit)
+                raise HashingPoolFull
+            self.depth += 1
+            self.peak_depth = max(self.peak_depth, self.depth)
+            executor = self._get_executor()
+        return executor.submit(self._timed, time.perf_counter(), fn, args)
+
+    def _timed(self, queued, fn, args):
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.depth -= 1
+                self.completed += 1
+                self.wait_time += started - queued
+                self.hash_time += finished - started
+
+    def run(self, fn, *args):
+        """
+        Run ``fn(*args)`` on the pool and return its result. A call still
+        queued after ``TIMEOUT`` seconds also raises HashingPoolFull.
+        """
+        try:
+            return self.submit(fn, *args).result(timeout=hashing_config()['TIMEOUT'])
+        except TimeoutError:
+            raise HashingPoolFull
+
+    async def arun(self, fn, *args):
+        """``run`` for async callers: awaits the result without blocking a thread."""
+        future = asyncio.wrap_future(self.submit(fn, *args))
+        try:
+            # Shielded: a cancelled call would never run and so never leave the queue count
+            return await asyncio.wait_for(asyncio.shield(future), hashing_config()['TIMEOUT'])
+        except asyncio.TimeoutError:
+            raise HashingPoolFull
+
+    def stats(self):
+        with self._lock:
+            return {
+                'depth': self.depth,
+                'peak_depth': self.peak_depth,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'wait_seconds': self.wait_time,
+                'hash_seconds': self.hash_time,
+            }
+
+
+pool = HashingPool()
+
+
+def make_password(raw_password):
+    """Hash ``raw_password`` on the pool."""
+    return pool.run(hashers.make_password, raw_password)
+
+
+def check_password(user, raw_password):
+    """
+    Verify ``raw_password`` against ``user``'s hash on the pool, upgrading
+    the stored hash when the hasher settings changed (like
+    ``AbstractBaseUser.check_password``).
+    """
+    is_correct, must_update = pool.run(hashers.verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = make_password(raw_password)
+        user.save(update_fields=['password'])
+    return is_correct
+
+
+async def amake_password(raw_password):
+    """Async ``make_password``."""
+    return await pool.arun(hashers.make_password, raw_password)
+
+
+async def acheck_password(user, raw_password):
+    """Async ``check_password``."""
+    is_correct, must_update = await pool.arun(hashers.verify_password, raw_password, user.password)
+    if is_correct and must_update:
+        user.password = await amake_password(raw_password)
+        await user.asave(update_fields=['password'])
+    return is_correct
@@ -0,0 +1,300 @@
+import csv
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from core import stats, sync
+from core.bulk import bulk_create_users
+from core.models import Task, Comment
+from core.signals import tasks_bulk_changed, comments_bulk_changed
+
+Assignment = Task.assigned_users.through
+
+STATUSES = {choice for choice, _ in Task.STATUS_CHOICES}
+PRIORITIES = {choice for choice, _ in Task.PRIORITY_CHOICES}
+
+
+class RowError(ValueError):
+    pass
+
+
+class UserResolver:
+    """
+    Resolve usernames to User ids with an in-memory cache.
+
+    Unknown usernames are looked up once per batch; users that still do not
+    exist are created in bulk (with an unusable password and a profile).
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.created = 0
+
+    def resolve(self, usernames):
+        missing = {name for name in usernames if name not in self.ids}
+        if missing:
+            for user_id, username in User.objects.filter(username__in=missing).values_list('id', 'username'):
+                self.ids[username] = user_id
+            new_users = []
+            for username in sorted(missing - self.ids.keys()):
+                user = User(username=username)
+                user.set_unusable_password()
+                new_users.append(user)
+            for user in bulk_create_users(new_users):
+                self.ids[user.username] = user.pk
+            self.created += len(new_users)
+        return self.ids
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """
+    Let bulk_create keep the imported created_at/timestamp values instead of
+    auto_now_add overwriting them. Rows without a value get the current time.
+    """
+    previous = [field.auto_now_add for field in fields]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, value in zip(fields, previous):
+            field.auto_now_add = value
+
+
+def parse_moment(value):
+    if not value:
+        return timezone.now()
+    moment = parse_datetime(value)
+    if moment is None:
+        raise RowError(f'invalid datetime {value!r}')
+    return moment if timezone.is_aware(moment) else timezone.make_aware(moment)
+
+
+def parse_id(value, name, required=False):
+    if value in (None, ''):
+        if required:
+            raise RowError(f'{name} is required')
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise RowError(f'invalid {name} {value!r}')
+
+
+def parse_usernames(value):
+    if isinstance(value, list):
+        return [str(name) for name in value]
+    return (value or '').split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-import tasks, comments or assignments from an NDJSON or CSV file in batches. "
+        "Users are referenced by username and created when missing. Progress is checkpointed "
+        "after every batch so an interrupted import can be resumed by running the same command again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['tasks', 'comments', 'assignments'])
+        parser.add_argument('path', help='NDJSON (.ndjson/.jsonl) or CSV (.csv) file')
+        parser.add_argument('--format', choices=['ndjson', 'csv'], help='defaults to the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--checkpoint', help='checkpoint file (default: <path>.checkpoint)')
+        parser.add_argument('--restart', action='store_true', help='ignore an existing checkpoint')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'File not found: {path}')
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+        checkpoint_path = options['checkpoint'] or f'{path}.checkpoint'
+
+        done = 0 if options['restart'] else self.read_checkpoint(checkpoint_path, options['kind'])
+        if done:
+            self.stdout.write(f'Resuming after row {done}')
+
+        self.users = UserResolver()
+        self.skipped = 0
+        importer = getattr(self, f'import_{options["kind"]}')
+        imported = 0
+        started = time.monotonic()
+
+        with open(path, newline='', encoding='utf-8') as source:
+            rows = self.read_rows(source, file_format)
+            batch = []
+            for number, row in enumerate(rows, start=1):
+                if number <= done:
+                    continue
+                batch.append((number, row))
+                if len(batch) == batch_size:
+                    imported += self.run_batch(importer, batch, checkpoint_path, options['kind'])
+                    self.report(imported, started)
+                    batch = []
+            if batch:
+                imported += self.run_batch(importer, batch, checkpoint_path, options['kind'])
+
+        self.reset_sequences()
+        if options['kind'] != 'comments':
+            # Bulk inserts bypass the incremental dashboard counts
+            stats.rebuild()
+        self.report(imported, started)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} {options["kind"]} ({self.skipped} skipped, {self.users.created} users created)'
+        ))
+
+    def read_rows(self, source, file_format):
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+            return
+        for line in source:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as exc:
+                    # Still a row, so it is numbered, skipped and checkpointed like the others
+                    yield RowError(f'invalid JSON: {exc}')
+
+    def read_checkpoint(self, checkpoint_path, kind):
+        if not os.path.exists(checkpoint_path):
+            return 0
+        with open(checkpoint_path) as checkpoint:
+            state = json.load(checkpoint)
+        if state.get('kind') != kind:
+            raise CommandError(f'{checkpoint_path} belongs to a {state.get("kind")} import; use --restart')
+        return state['rows']
+
+    def write_checkpoint(self, checkpoint_path, kind, rows):
+        temporary = f'{checkpoint_path}.tmp'
+        with open(temporary, 'w') as checkpoint:
+            json.dump({'kind': kind, 'rows': rows}, checkpoint)
+        os.replace(temporary, checkpoint_path)
+
+    def run_batch(self, importer, batch, checkpoint_path, kind):
+        parsed = []
+        for number, row in batch:
+            try:
+                parsed.append(self.parse_row(kind, row))
+            except (RowError, KeyError, AttributeError) as exc:
+                self.skipped += 1
+                self.stderr.write(f'Row {number} skipped: {exc}')
+
+        try:
+            with sync.bounded_write():
+                count = importer(parsed) if parsed else 0
+        except sync.WriteTooSlow as exc:
+            raise CommandError(f'Batch ending at row {batch[-1][0]} rolled back: {exc}; lower --batch-size')
+        # Only advance the checkpoint once the batch is committed
+        self.write_checkpoint(checkpoint_path, kind, batch[-1][0])
+        return count
+
+    def parse_row(self, kind, row):
+        if isinstance(row, RowError):
+            raise row
+        if kind == 'tasks':
+            if row.get('status') not in STATUSES:
+                raise RowError(f'invalid status {row.get("status")!r}')
+            if row.get('priority') not in PRIORITIES:
+                raise RowError(f'invalid priority {row.get("priority")!r}')
+            return {
+                'id': parse_id(row.get('id'), 'id'),
+                'title': row['title'],
+                'description': row.get('description') or '',
+                'status': row['status'],
+                'priority': row['priority'],
+                'created_at': parse_moment(row.get('created_at')),
+                'assigned_users': parse_usernames(row.get('assigned_users')),
+            }
+        if kind == 'comments':
+            return {
+                'id': parse_id(row.get('id'), 'id'),
+                'task_id': parse_id(row.get('task'), 'task', required=True),
+                'user': row['user'],
+                'content': row['content'],
+                'timestamp': parse_moment(row.get('timestamp')),
+            }
+        return {
+            'task_id': parse_id(row.get('task'), 'task', required=True),
+            'user': row['user'],
+        }
+
+    def existing_tasks(self, rows):
+        task_ids = {row['task_id'] for row in rows}
+        existing = set(Task.objects.filter(pk__in=task_ids).values_list('pk', flat=True))
+        kept = [row for row in rows if row['task_id'] in existing]
+        if len(kept) != len(rows):
+            self.skipped += len(rows) - len(kept)
+            self.stderr.write(f'{len(rows) - len(kept)} rows skipped: unknown task ids')
+        return kept
+
+    def import_tasks(self, rows):
+        user_ids = self.users.resolve({name for row in rows for name in row['assigned_users']})
+        # Rows carrying their own ids make a re-run of a batch idempotent
+        explicit_ids = all(row['id'] is not None for row in rows)
+        tasks = [
+            Task(
+                **{key: value for key, value in row.items() if key != 'assigned_users' and value is not None},
+                # Not the import time: imported tasks are only as active as their creation
+                last_activity_at=row['created_at'],
+            )
+            for row in rows
+        ]
+        with explicit_timestamps(Task._meta.get_field('created_at')):
+            tasks = Task.objects.bulk_create(tasks, ignore_conflicts=explicit_ids)
+        Assignment.objects.bulk_create([
+            Assignment(task_id=task.pk, user_id=user_ids[name])
+            for task, row in zip(tasks, rows)
+            for name in row['assigned_users']
+        ], ignore_conflicts=True)
+        tasks_bulk_changed.send(sender=Task, task_ids=[task.pk for task in tasks], action='create')
+        return len(tasks)
+
+    def import_comments(self, rows):
+        rows = self.existing_tasks(rows)
+        user_ids = self.users.resolve({row['user'] for row in rows})
+        explicit_ids = bool(rows) and all(row['id'] is not None for row in rows)
+        comments = [
+            Comment(
+                id=row['id'], task_id=row['task_id'], user_id=user_ids[row['user']],
+                content=row['content'], timestamp=row['timestamp'],
+            )
+            for row in rows
+        ]
+        with explicit_timestamps(Comment._meta.get_field('timestamp')):
+            comments = Comment.objects.bulk_create(comments, ignore_conflicts=explicit_ids)
+        comments_bulk_changed.send(sender=Comment, comments=comments, action='create')
+        return len(comments)
+
+    def import_assignments(self, rows):
+        rows = self.existing_tasks(rows)
+        user_ids = self.users.resolve({row['user'] for row in rows})
+        Assignment.objects.bulk_create([
+            Assignment(task_id=row['task_id'], user_id=user_ids[row['user']]) for row in rows
+        ], ignore_conflicts=True)
+        task_ids = {row['task_id'] for row in rows}
+        # The through table bypasses the m2m signals that mark tasks changed for sync
+        Task.objects.filter(pk__in=task_ids).touch()
+        tasks_bulk_changed.send(sender=Task, task_ids=task_ids, action='update')
+        return len(rows)
+
+    def reset_sequences(self):
+        # Imported explicit ids leave the primary key sequences behind on PostgreSQL
+        statements = connection.ops.sequence_reset_sql(no_style(), [Task, Comment])
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def report(self, imported, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        self.stdout.write(f'{imported} rows imported in {elapsed:.1f}s ({imported / elapsed:.0f} rows/s)')
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import random
+import resource
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import benchmark_database
+from core.benchmarks.suite import PERCENTILES, percentile, seed
+
+DEFAULT_MIX = 'task_list:4,task_detail:3,task_create:1,comment_list:2,comment_create:1'
+
+
+def rest_operations(task_ids):
+    """Map each operation of the mix to a function returning (method, path, body)."""
+    def task_body(rng):
+        return {'title': f'Load task {rng.random()}', 'description': 'loadgen', 'status': 'Not Started', 'priority': 'Low'}
+
+    return {
+        'task_list': lambda rng: ('GET', '/api/tasks/', None),
+        'task_detail': lambda rng: ('GET', f'/api/tasks/{rng.choice(task_ids)}/', None),
+        'task_create': lambda rng: ('POST', '/api/tasks/', task_body(rng)),
+        'comment_list': lambda rng: ('GET', '/api/comments/', None),
+        'comment_create': lambda rng: ('POST', '/api/comments/', {
+            'task': rng.choice(task_ids), 'content': f'Load comment {rng.random()}',
+        }),
+    }
+
+
+def parse_mix(value, operations):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition(':')
+        name = name.strip()
+        if name not in operations:
+            raise CommandError(f'Unknown operation {name!r} in --mix, expected: {", ".join(operations)}')
+        if not weight.isdigit():
+            raise CommandError(f'--mix weights must be integers: {part!r}')
+        mix[name] = int(weight)
+    if not any(mix.values()):
+        raise CommandError('--mix needs at least one operation with a positive weight')
+    return mix
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return {}
+    return {f'p{percent}_ms': round(percentile(latencies, percent) * 1000, 2) for percent in PERCENTILES}
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate REST and WebSocket load against the ASGI application in-process, on a throwaway "
+        "database and the in-memory channel layer, and report throughput, latency percentiles and peak RSS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=10, help='seconds of load')
+        parser.add_argument('--concurrency', type=int, default=10, help='concurrent REST clients')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='weighted REST operations, e.g. task_list:4,task_create:1')
+        parser.add_argument('--ws-clients', type=int, default=50, help='concurrent ws/task/<id>/ clients')
+        parser.add_argument('--ws-tasks', type=int, default=5, help='tasks the WebSocket clients are spread over')
+        parser.add_argument('--ws-rate', type=float, default=20, help='messages per second published per task')
+        parser.add_argument('--users', type=int, default=20, help='seeded users')
+        parser.add_argument('--tasks', type=int, default=500, help='seeded tasks')
+        parser.add_argument('--comments', type=int, default=2000, help='seeded comments')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--json', action='store_true', help='print the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['duration'] <= 0 or options['concurrency'] < 0 or options['ws_clients'] < 0:
+            raise CommandError('--duration must be positive and client counts non-negative')
+        settings.CHANNEL_LAYERS = {'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+        rng = random.Random(options['seed'])
+
+        with benchmark_database():
+            user, task_ids, _ = seed(rng, options['users'], options['tasks'], options['comments'], assignees=2)
+            operations = rest_operations(task_ids)
+            mix = parse_mix(options['mix'], operations)
+            from rest_framework_simplejwt.tokens import RefreshToken
+            from taskmanager.asgi import application
+
+            token = str(RefreshToken.for_user(user).access_token)
+            report = asyncio.run(self.run(application, rng, token, operations, mix, task_ids, options))
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        for name, result in report['rest']['operations'].items():
+            self.stdout.write(
+                f'{name:>15}: {result["requests"]:7d} req  {result["errors"]:4d} errors  '
+                + '  '.join(f'{key} {value:8.2f}' for key, value in result['latency'].items())
+            )
+        self.stdout.write(f'{"REST":>15}: {report["rest"]["requests_per_second"]:10.1f} req/s')
+        ws = report['websocket']
+        self.stdout.write(
+            f'{"WebSocket":>15}: {ws["deliveries_per_second"]:10.1f} deliveries/s  '
+            + '  '.join(f'{key} {value:8.2f}' for key, value in ws['latency'].items())
+        )
+        self.stdout.write(f'{"peak RSS":>15}: {report["peak_rss_mb"]:10.1f} MB')
+
+    async def run(self, application, rng, token, operations, mix, task_ids, options):
+        deadline = time.perf_counter() + options['duration']
+        rest_results = defaultdict(list)
+        ws_latencies = []
+        ws_tasks = task_ids[:max(1, options['ws_tasks'])]
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                self.rest_client(application, random.Random(rng.random()), token, operations, mix, deadline, rest_results)
+                for _ in range(options['concurrency'])
+            ),
+            self.websocket_load(application, ws_tasks, options['ws_clients'], options['ws_rate'], deadline, ws_latencies),
+        )
+        elapsed = time.perf_counter() - started
+
+        requests = sum(len(results) for results in rest_results.values())
+        return {
+            'duration': round(elapsed, 3),
+            'rest': {
+                'concurrency': options['concurrency'],
+                'requests': requests,
+                'requests_per_second': round(requests / elapsed, 1),
+                'operations': {
+                    name: {
+                        'requests': len(results),
+                        'errors': sum(1 for _, status in results if status >= 400),
+                        'latency': latency_summary([latency for latency, _ in results]),
+                    }
+                    for name, results in sorted(rest_results.items())
+                },
+            },
+            'websocket': {
+                'clients': options['ws_clients'],
+                'deliveries': len(ws_latencies),
+                'deliveries_per_second': round(len(ws_latencies) / elapsed, 1),
+                'latency': latency_summary(ws_latencies),
+            },
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+
+    async def rest_client(self, application, rng, token, operations, mix, deadline, results):
+        from channels.testing import HttpCommunicator
+
+        names, weights = list(mix), list(mix.values())
+        headers = [
+            # 'testserver' is allowed by the test environment the throwaway database sets up
+            (b'host', b'testserver'),
+            (b'authorization', f'Bearer {token}'.encode()),
+            (b'content-type', b'application/json'),
+        ]
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            method, path, body = operations[name](rng)
+            body = json.dumps(body).encode() if body else b''
+            communicator = HttpCommunicator(
+                application, method, path, body=body, headers=headers + [(b'content-length', str(len(body)).encode())],
+            )
+            started = time.perf_counter()
+            response = await communicator.get_response(timeout=60)
+            results[name].append((time.perf_counter() - started, response['status']))
+            # Let the handler finish its disconnect listener before dropping the communicator
+            await communicator.send_input({'type': 'http.disconnect'})
+            await communicator.wait(timeout=60)
+
+    async def websocket_load(self, application, task_ids, clients, rate, deadline, latencies):
+        from channels.testing import WebsocketCommunicator
+
+        if not clients:
+            return
+        subscribers = [WebsocketCommunicator(application, f'/ws/task/{task_ids[i % len(task_ids)]}/') for i in range(clients)]
+        for communicator in subscribers:
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError('WebSocket connection was rejected')
+
+        await asyncio.gather(
+            *(self.publish(task_id, rate, deadline) for task_id in task_ids),
+            *(self.subscribe(subscriber, latencies) for subscriber in subscribers),
+        )
+        for communicator in subscribers:
+            await communicator.disconnect()
+
+    async def publish(self, task_id, rate, deadline):
+        """Broadcast to the task's group the way server-side change events are published."""
+        from channels.layers import get_channel_layer
+        from core import eventlog
+        from core.events import group_name, task_event
+
+        layer = get_channel_layer()
+        interval = 1 / rate if rate > 0 else None
+        while interval and time.perf_counter() < deadline:
+            text = await eventlog.aappend(task_id, {'sent': time.perf_counter()})
+            await layer.group_send(group_name(task_id), task_event(task_id, text))
+            await asyncio.sleep(interval)
+        # Subscribers stop reading once they see this message
+        await layer.group_send(group_name(task_id), task_event(task_id, json.dumps({'stop': True})))
+
+    async def subscribe(self, communicator, latencies):
+        while True:
+            frame = json.loads(await communicator.receive_from(timeout=60))
+            received = time.perf_counter()
+            for message in frame if isinstance(frame, list) else [frame]:
+                if message.get('stop'):
+                    return
+                # Change events caused by the REST load arrive too; only probes carry 'sent'
+                if 'sent' in message:
+                    latencies.append(received - message['sent'])
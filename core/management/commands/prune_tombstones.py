@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core import sync
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the Tombstone rows older than TASK_CHANGES_TOMBSTONE_DAYS. Clients whose sync "
+        "token is older than that are asked for a full resync. Run it periodically, e.g. daily."
+    )
+
+    def handle(self, *args, **options):
+        deleted = sync.prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} tombstones'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the TaskStat dashboard counts from the tasks and their assignments. "
+        "With --check, only report the counts that have drifted and fail if there are any."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='compare without rebuilding')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drifted = stats.check()
+            for (status, priority, user_id), (stored, expected) in sorted(drifted.items(), key=str):
+                owner = 'all users' if user_id is None else f'user {user_id}'
+                self.stdout.write(f'{status}/{priority} for {owner}: stored {stored}, expected {expected}')
+            if drifted:
+                raise CommandError(f'{len(drifted)} task counts are inconsistent; run rebuild_task_stats')
+            self.stdout.write(self.style.SUCCESS('Task counts are consistent'))
+            return
+
+        rows = stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} task count rows'))
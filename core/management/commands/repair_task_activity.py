@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import sync
+from core.caching import invalidate_tasks
+from core.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized Task.comment_count and Task.last_activity_at "
+        "from the comments table, walking the tasks in primary key batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be positive')
+
+        last_id = 0
+        repaired = 0
+        started = time.monotonic()
+        while True:
+            task_ids = list(
+                Task.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not task_ids:
+                break
+            try:
+                with sync.bounded_write():
+                    Task.objects.filter(pk__in=task_ids).refresh_activity()
+                    invalidate_tasks(task_ids)
+            except sync.WriteTooSlow as exc:
+                raise CommandError(f'Batch after task {last_id} rolled back: {exc}; lower --batch-size')
+            repaired += len(task_ids)
+            last_id = task_ids[-1]
+            self.stdout.write(f'{repaired} tasks repaired')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'Repaired {repaired} tasks in {elapsed:.1f}s'))
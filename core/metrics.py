@@ -0,0 +1,166 @@
+"""
+Opt-in per-request instrumentation.
+
+``RequestMetricsMiddleware`` records, for every request, the number of SQL
+queries, the time spent in the database, the time spent rendering
+serializers and the total time. It reports them in a ``Server-Timing``
+response header and a structured ``core.metrics`` log line, and logs a
+warning for slow requests and for SQL statements repeated often enough to
+suggest an N+1 pattern.
+
+Enable it with the ``REQUEST_METRICS`` setting (see METRICS_DEFAULTS).
+When it is disabled the middleware removes itself from the stack at
+startup, and ``TimedSerializerMixin`` only costs a context variable lookup.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+METRICS_DEFAULTS = {
+    'ENABLED': False,
+    # Add a Server-Timing header to every response
+    'SERVER_TIMING': True,
+    # Requests slower than this are logged as warnings
+    'SLOW_REQUEST_MS': 500,
+    # A statement fingerprint executed this often in one request is logged as N+1
+    'REPEATED_QUERY_THRESHOLD': 5,
+}
+
+_current = ContextVar('request_metrics', default=None)
+
+_WHITESPACE = re.compile(r'\s+')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))*\s*\)')
+
+
+def metrics_config():
+    return {**METRICS_DEFAULTS, **getattr(settings, 'REQUEST_METRICS', {})}
+
+
+def fingerprint(sql):
+    """
+    Normalize a statement so repetitions with different parameters compare
+    equal: literals become ``?`` and ``IN`` lists collapse to ``(...)``.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class RequestMetrics:
+    """Measurements of a single request, collected while it is handled."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.fingerprints = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing every statement."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    def total_time(self):
+        return time.perf_counter() - self.started
+
+
+def current_metrics():
+    """Return the metrics of the request being handled, or None."""
+    return _current.get()
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin adding the time spent in ``to_representation`` to the
+    current request's metrics. Nested serializers are counted as part of
+    the outermost one.
+    """
+
+    def to_representation(self, instance):
+        metrics = _current.get()
+        if metrics is None or metrics.serializing:
+            return super().to_representation(instance)
+        metrics.serializing = True
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            metrics.serializer_time += time.perf_counter() - started
+            metrics.serializing = False
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, serializer time and total time per request.
+    Raises MiddlewareNotUsed unless ``REQUEST_METRICS['ENABLED']`` is set.
+    """
+
+    def __init__(self, get_response):
+        self.config = metrics_config()
+        if not self.config['ENABLED']:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        total = metrics.total_time()
+        if self.config['SERVER_TIMING']:
+            response['Server-Timing'] = ', '.join([
+                f'db;desc="{metrics.queries} queries";dur={metrics.db_time * 1000:.2f}',
+                f'serializer;dur={metrics.serializer_time * 1000:.2f}',
+                f'total;dur={total * 1000:.2f}',
+            ])
+        self.log(request, response, metrics, total)
+        return response
+
+    def log(self, request, response, metrics, total):
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            'db_ms': round(metrics.db_time * 1000, 2),
+            'serializer_ms': round(metrics.serializer_time * 1000, 2),
+            'total_ms': round(total * 1000, 2),
+        }
+        logger.info('request %s', json.dumps(record), extra={'request_metrics': record})
+
+        if record['total_ms'] >= self.config['SLOW_REQUEST_MS']:
+            logger.warning('slow request %s', json.dumps(record), extra={'request_metrics': record})
+
+        threshold = self.config['REPEATED_QUERY_THRESHOLD']
+        for statement, count in metrics.fingerprints.most_common():
+            if count < threshold:
+                break
+            repeated = {'method': request.method, 'path': request.path, 'count': count, 'sql': statement}
+            logger.warning('repeated query %s', json.dumps(repeated), extra={'request_metrics': repeated})
@@ -0,0 +1,25 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from social_django import middleware as social_middleware
+
+
+class SocialAuthExceptionMiddleware(social_middleware.SocialAuthExceptionMiddleware):
+    """
+    social_django's SocialAuthExceptionMiddleware, made async-capable.
+
+    The upstream class is sync-only, and a single sync-only middleware makes
+    Django run every request under ASGI, async views included, in a thread
+    held for the request's duration. Its behaviour lives in ``process_exception``,
+    which Django adapts to either mode; ``__call__`` only passes through.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        # In async mode this returns the coroutine Django awaits
+        return self.get_response(request)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_comment_options_alter_task_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['-timestamp', '-id'], name='core_commen_timesta_b46777_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-created_at', '-id'], name='core_task_created_a73452_idx'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:20
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# GIN indexes and the initial backfill only apply to PostgreSQL; on other
+# databases the columns stay empty and search falls back to icontains.
+FORWARD_SQL = [
+    "CREATE INDEX IF NOT EXISTS core_task_search_vector_gin ON core_task USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS core_comment_search_vector_gin ON core_comment USING gin (search_vector)",
+    "UPDATE core_task SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+    "UPDATE core_comment SET search_vector = to_tsvector('english', coalesce(content, ''))",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS core_task_search_vector_gin",
+    "DROP INDEX IF EXISTS core_comment_search_vector_gin",
+]
+
+
+def run_on_postgres(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(run_on_postgres(FORWARD_SQL), run_on_postgres(BACKWARD_SQL)),
+    ]
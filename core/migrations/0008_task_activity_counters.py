@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:34
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+
+def backfill_activity(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    Comment = apps.get_model('core', 'Comment')
+    comments = Comment.objects.filter(task=OuterRef('pk')).order_by()
+    Task.objects.update(
+        comment_count=Coalesce(Subquery(comments.values('task').annotate(count=Count('pk')).values('count')), 0),
+        last_activity_at=Greatest('created_at', Coalesce(
+            Subquery(comments.order_by('-timestamp').values('timestamp')[:1]), 'created_at'
+        )),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_search_vectors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-comment_count', '-id'], name='core_task_comment_c9beeb_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-last_activity_at', '-id'], name='core_task_last_ac_0016c1_idx'),
+        ),
+    ]
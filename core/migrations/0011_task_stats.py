@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-18 19:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_task_stats(apps, schema_editor):
+    Task = apps.get_model('core', 'Task')
+    TaskStat = apps.get_model('core', 'TaskStat')
+    rows = [
+        TaskStat(status=row['status'], priority=row['priority'], count=row['count'])
+        for row in Task.objects.order_by().values('status', 'priority').annotate(count=Count('pk'))
+    ]
+    rows += [
+        TaskStat(status=row['task__status'], priority=row['task__priority'], user_id=row['user_id'], count=row['count'])
+        for row in Task.assigned_users.through.objects.order_by()
+        .values('task__status', 'task__priority', 'user_id').annotate(count=Count('pk'))
+    ]
+    TaskStat.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_sync_changes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('Not Started', 'Not Started'), ('In Progress', 'In Progress'), ('Completed', 'Completed')], max_length=20)),
+                ('priority', models.CharField(choices=[('Low', 'Low'), ('Medium', 'Medium'), ('High', 'High')], max_length=10)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Task statistic',
+                'verbose_name_plural': 'Task statistics',
+                'constraints': [models.UniqueConstraint(fields=('user', 'status', 'priority'), name='unique_task_stat_per_user'), models.UniqueConstraint(condition=models.Q(('user__isnull', True)), fields=('status', 'priority'), name='unique_task_stat_overall')],
+            },
+        ),
+        migrations.RunPython(populate_task_stats, migrations.RunPython.noop),
+    ]
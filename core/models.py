@@ -1,5 +1,9 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 
 class UserProfile(models.Model):
@@ -8,14 +12,70 @@ class UserProfile(models.Model):
     """
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     avatar = models.ImageField(upload_to='avatars/', null=True, blank=True)
+    # Storage paths of the resized avatar, rendered in the background (see core/avatars.py)
+    avatar_variants = models.JSONField(default=dict, blank=True, editable=False)
 
     def __str__(self):
         return self.user.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The stored avatar, to detect uploads when the profile is saved
+        instance._avatar_name = instance.__dict__.get('avatar') or ''
+        return instance
+
+
+class TaskQuerySet(models.QuerySet):
+
+    # QuerySet.update() and bulk_update() skip auto_now, so every method
+    # below sets updated_at itself.
+
+    def touch(self):
+        """Mark the tasks as changed, e.g. after their assignees changed."""
+        return self.update(updated_at=timezone.now())
+
+    def comment_added(self, timestamp):
+        """Atomically count a new comment and record it as activity."""
+        return self.update(
+            comment_count=F('comment_count') + 1,
+            last_activity_at=Greatest('last_activity_at', Value(timestamp)),
+            updated_at=timezone.now(),
+        )
+
+    def comment_removed(self):
+        """Atomically uncount a deleted comment."""
+        return self.update(comment_count=Greatest(F('comment_count') - 1, Value(0)), updated_at=timezone.now())
+
+    def refresh_activity(self):
+        """
+        Recompute comment_count and last_activity_at from the comments table:
+        the latest comment's timestamp, or created_at for uncommented tasks.
+        The stored value is deliberately not used as a floor, so a wrong
+        (e.g. import-time) value is corrected rather than kept.
+        """
+        comments = Comment.objects.filter(task=OuterRef('pk')).order_by()
+        counts = comments.values('task').annotate(count=Count('pk')).values('count')
+        latest = comments.order_by('-timestamp').values('timestamp')[:1]
+        return self.update(
+            comment_count=Coalesce(Subquery(counts), 0),
+            last_activity_at=Coalesce(Subquery(latest), 'created_at'),
+            updated_at=timezone.now(),
+        )
+
 
 class Task(models.Model):
     """
     Represents a task with a title, description, status, priority, and assigned users.
+
+    ``comment_count`` and ``last_activity_at`` are denormalized activity
+    counters, maintained with atomic updates when comments are created or
+    deleted (see ``core/signals.py``) and repairable with the
+    ``repair_task_activity`` command. Activity means comments only: edits
+    to the task itself show in ``updated_at``, not ``last_activity_at``.
+
+    ``updated_at`` changes whenever the task's API representation may have
+    changed, which drives the delta sync endpoint (see ``core/sync.py``).
     """
     STATUS_CHOICES = [
         ('Not Started', 'Not Started'),
@@ -35,11 +95,27 @@ class Task(models.Model):
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, db_index=True)
     assigned_users = models.ManyToManyField(User, related_name='tasks')
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    comment_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Fields written by atomic UPDATEs or signals, never by a plain save()
+    MAINTAINED_FIELDS = ('search_vector', 'comment_count', 'last_activity_at')
+
+    objects = TaskQuerySet.as_manager()
 
     class Meta:
         indexes = [
             models.Index(fields=['status']),
             models.Index(fields=['priority']),
+            models.Index(fields=['-created_at', '-id']),
+            models.Index(fields=['status', 'priority', '-created_at']),
+            models.Index(fields=['status', '-created_at']),
+            models.Index(fields=['priority', '-created_at']),
+            models.Index(fields=['-comment_count', '-id']),
+            models.Index(fields=['-last_activity_at', '-id']),
+            models.Index(fields=['updated_at', 'id']),
         ]
         ordering = ['-created_at']
         verbose_name = 'Task'
@@ -48,6 +124,25 @@ class Task(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Don't write back maintained fields that may have changed in the
+        database since this instance was loaded.
+
+        Updates run in a transaction, in which the ``pre_save`` handler of
+        ``core/signals.py`` locks the row to read the stored status and
+        priority for the TaskStat deltas.
+        """
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        if kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MAINTAINED_FIELDS
+            ]
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     """
@@ -57,11 +152,74 @@ class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
+        indexes = [
+            models.Index(fields=['-timestamp', '-id']),
+            models.Index(fields=['task', '-timestamp', '-id']),
+            models.Index(fields=['updated_at', 'id']),
+        ]
         ordering = ['-timestamp']
         verbose_name = 'Comment'
         verbose_name_plural = 'Comments'
 
     def __str__(self):
         return f'Comment by {self.user.username} on "{self.task.title}"'
+
+
+class TaskStat(models.Model):
+    """
+    Number of tasks per (status, priority), overall (``user`` is null) and
+    per assigned user.
+
+    Maintained incrementally from ``core/signals.py`` and ``core/bulk.py``
+    (see ``core/stats.py``); ``rebuild_task_stats`` recomputes it from scratch.
+    """
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=Task.PRIORITY_CHOICES)
+    user = models.ForeignKey(User, null=True, blank=True, on_delete=models.CASCADE, related_name='task_stats')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'status', 'priority'], name='unique_task_stat_per_user'),
+            # NULLs are distinct in unique constraints, so the overall rows need their own
+            models.UniqueConstraint(
+                fields=['status', 'priority'], condition=models.Q(user__isnull=True), name='unique_task_stat_overall'
+            ),
+        ]
+        verbose_name = 'Task statistic'
+        verbose_name_plural = 'Task statistics'
+
+    def __str__(self):
+        return f'{self.status}/{self.priority}: {self.count}'
+
+
+class Tombstone(models.Model):
+    """
+    Records the deletion of a task or comment, so that clients syncing
+    changes (see ``core/sync.py``) learn about records that no longer exist.
+    """
+    TASK = 'task'
+    COMMENT = 'comment'
+    MODEL_CHOICES = [
+        (TASK, 'Task'),
+        (COMMENT, 'Comment'),
+    ]
+
+    model = models.CharField(max_length=10, choices=MODEL_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['deleted_at', 'id']),
+        ]
+        ordering = ['deleted_at', 'id']
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+
+    def __str__(self):
+        return f'{self.get_model_display()} {self.object_id} deleted at {self.deleted_at}'
@@ -0,0 +1,166 @@
+import json
+from datetime import date
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def reverse_ordering(ordering):
+    return [name[1:] if name.startswith('-') else '-' + name for name in ordering]
+
+
+def keyset_filter(ordering, position):
+    """
+    Rows strictly after ``position`` (the values of every ordering field)
+    in ``ordering``: ``(a > x) OR (a = x AND b > y) OR ...``, each
+    comparison in its field's direction.
+    """
+    after, equal = Q(), Q()
+    for name, value in zip(ordering, position):
+        field = name.lstrip('-')
+        lookup = 'lt' if name.startswith('-') else 'gt'
+        after |= equal & Q(**{f'{field}__{lookup}': value})
+        equal &= Q(**{field: value})
+    return after
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor pagination on the full ordering.
+
+    DRF's cursors hold the value of the first ordering field only, plus an
+    offset over the rows sharing it that is capped at ``offset_cutoff``, so
+    with more ties than that (``?ordering=-comment_count`` when most tasks
+    have no comments) paging never gets past them. Here the ordering always
+    ends with ``id``, the cursor holds the values of every ordering field
+    of the row it points at, and a page is the rows strictly after them.
+
+    Pagination is split around the single query it runs, so
+    ``apaginate_queryset`` only swaps its evaluation for the async ORM.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        return None if queryset is None else self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        # aiterator only honours prefetch_related() with a chunk_size
+        return self.set_page([item async for item in queryset.aiterator(chunk_size=self.page_size + 1)])
+
+    def get_ordering(self, request, queryset, view):
+        ordering = list(super().get_ordering(request, queryset, view))
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[0].startswith('-') else 'id')
+        return ordering
+
+    def page_queryset(self, queryset, request, view=None):
+        """Return the (unevaluated) query for the requested page and one extra row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        self.position = self.decode_position(self.cursor, queryset.model)
+
+        ordering = self.ordering
+        if self.cursor is not None and self.cursor.reverse:
+            ordering = reverse_ordering(ordering)
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(keyset_filter(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        """Record the page and the neighbouring cursor positions from the fetched rows."""
+        self.page = list(results[:self.page_size])
+        has_following = len(results) > len(self.page)
+        reverse = self.cursor is not None and self.cursor.reverse
+        if reverse:
+            # The query ran backwards from the cursor; restore the requested order
+            self.page.reverse()
+            self.has_previous, self.has_next = has_following, True
+        else:
+            self.has_previous, self.has_next = self.position is not None, has_following
+
+        cursor_position = self.cursor.position if self.cursor else None
+        self.previous_position = self.encode_position(self.page[0]) if self.page else cursor_position
+        self.next_position = self.encode_position(self.page[-1]) if self.page else cursor_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def encode_position(self, instance):
+        values = []
+        for name in self.ordering:
+            value = getattr(instance, name.lstrip('-'))
+            # Full precision: the position must compare equal to the stored value
+            values.append(value.isoformat() if isinstance(value, date) else value)
+        return json.dumps(values)
+
+    def decode_position(self, cursor, model):
+        if cursor is None or cursor.position is None:
+            return None
+        try:
+            position = json.loads(cursor.position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor from another ordering (e.g. the ordering parameter changed)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        # The cursor comes from the client: every value must fit its field
+        values = []
+        for name, value in zip(self.ordering, position):
+            name = name.lstrip('-')
+            field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+            try:
+                value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+
+class TaskCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for tasks, newest first.
+
+    The cursor encodes the position in the (-created_at, -id) ordering,
+    so every page is a bounded index range scan no matter how deep the
+    client pages, and rows inserted while paging do not shift the results.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+class CommentCursorPagination(KeysetCursorPagination):
+    """
+    Keyset pagination for comments, newest first, using the
+    (-timestamp, -id) ordering.
+    """
+    ordering = ('-timestamp', '-id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
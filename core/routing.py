@@ -3,4 +3,5 @@ from core import consumers
 
 websocket_urlpatterns = [
     re_path(r'ws/task/(?P<task_id>\d+)/$', consumers.TaskConsumer.as_asgi()),
+    re_path(r'ws/tasks/$', consumers.TaskMultiplexConsumer.as_asgi()),
 ]
\ No newline at end of file
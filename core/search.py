@@ -0,0 +1,74 @@
+"""
+Full-text search over tasks and comments.
+
+On PostgreSQL, ``Task.search_vector`` and ``Comment.search_vector`` hold
+precomputed ``tsvector`` values (GIN indexed, see migration 0007) that are
+refreshed from ``core/signals.py`` on every write, and results are ranked with
+``ts_rank``. Other databases fall back to ``icontains`` matching so the
+test-suite can run on SQLite.
+"""
+
+from functools import reduce
+import operator
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, Q
+
+SEARCH_CONFIG = 'english'
+
+TASK_VECTOR = (
+    SearchVector('title', weight='A', config=SEARCH_CONFIG)
+    + SearchVector('description', weight='B', config=SEARCH_CONFIG)
+)
+COMMENT_VECTOR = SearchVector('content', config=SEARCH_CONFIG)
+
+
+def full_text_enabled():
+    """Return True when the database supports tsvector search."""
+    return connection.vendor == 'postgresql'
+
+
+def update_task_vectors(task_ids):
+    """Recompute the search vector of the given tasks."""
+    from .models import Task
+
+    if full_text_enabled() and task_ids:
+        Task.objects.filter(pk__in=task_ids).update(search_vector=TASK_VECTOR)
+
+
+def update_comment_vectors(comment_ids):
+    """Recompute the search vector of the given comments."""
+    from .models import Comment
+
+    if full_text_enabled() and comment_ids:
+        Comment.objects.filter(pk__in=comment_ids).update(search_vector=COMMENT_VECTOR)
+
+
+def _search(queryset, text, fields):
+    if full_text_enabled():
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset.filter(search_vector=query)
+            .annotate(rank=SearchRank(F('search_vector'), query))
+            .order_by('-rank', '-id')
+        )
+
+    terms = text.split()
+    if not terms:
+        return queryset.none()
+    conditions = [
+        reduce(operator.or_, (Q(**{f'{field}__icontains': term}) for field in fields))
+        for term in terms
+    ]
+    return queryset.filter(reduce(operator.and_, conditions))
+
+
+def search_tasks(queryset, text):
+    """Filter a Task queryset to the tasks matching ``text``, best match first."""
+    return _search(queryset, text, ('title', 'description'))
+
+
+def search_comments(queryset, text):
+    """Filter a Comment queryset to the comments matching ``text``, best match first."""
+    return _search(queryset, text, ('content',))
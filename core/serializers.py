@@ -1,14 +1,52 @@
 from rest_framework import serializers
+from django.conf import settings
+from django.core.files.storage import default_storage
 from django.contrib.auth.models import User
-from .models import Task, Comment
+from . import hashing
+from .metrics import TimedSerializerMixin
+from .models import Task, Comment, UserProfile
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
-class UserSerializer(serializers.ModelSerializer):
-    """Serializer for User model with limited fields."""
+def comment_window():
+    """Number of recent comments embedded in a task detail response."""
+    return getattr(settings, 'TASK_DETAIL_COMMENT_WINDOW', 10)
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for User model with limited fields.
+
+    ``avatar`` is the URL of the uploaded original and ``avatar_variants``
+    maps each rendered size to its URL per format, e.g.
+    ``{"small": {"webp": ..., "jpeg": ...}}`` (empty until the background
+    rendering has finished). Querysets should ``select_related('userprofile')``.
+    """
+
+    avatar = serializers.SerializerMethodField()
+    avatar_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = User
-        fields = ['id', 'username', 'email']
+        fields = ['id', 'username', 'email', 'avatar', 'avatar_variants']
+
+    def _profile(self, obj):
+        try:
+            return obj.userprofile
+        except UserProfile.DoesNotExist:
+            return None
+
+    def get_avatar(self, obj):
+        profile = self._profile(obj)
+        return profile.avatar.url if profile and profile.avatar else None
+
+    def get_avatar_variants(self, obj):
+        profile = self._profile(obj)
+        if profile is None:
+            return {}
+        return {
+            label: {file_format: default_storage.url(path) for file_format, path in formats.items()}
+            for label, formats in profile.avatar_variants.items()
+        }
 
 class RegisterSerializer(serializers.ModelSerializer):
     """
@@ -51,10 +89,21 @@ class RegisterSerializer(serializers.ModelSerializer):
         password = validated_data['password1']
 
         user = User(username=username, email=email)
-        user.set_password(password)  # Hash the password properly
+        # Hash the password properly, on the bounded hashing pool
+        user.password = hashing.make_password(password)
         user.save()
         return user
 
+    async def acreate(self, validated_data):
+        """
+        ``create`` for the async registration view, awaiting the password
+        hash on the pool.
+        """
+        user = User(username=validated_data['username'], email=validated_data.get('email'))
+        user.password = await hashing.amake_password(validated_data['password1'])
+        await user.asave()
+        return user
+
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
@@ -78,30 +127,101 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
         data = super().validate(attrs)
 
         # Add extra response data
-        data.update({
+        data.update(self.login_details(self.user))
+        return data
+
+    @staticmethod
+    def login_details(user):
+        """The success message and user info added to the tokens."""
+        return {
             'message': 'User logged in successfully',
             'user': {
-                'username': self.user.username,
-                'email': self.user.email,
+                'username': user.username,
+                'email': user.email,
             }
-        })
-        return data
+        }
+
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for Comment model with read-only user and timestamp fields.
+
+    ``author`` is the commenting user, with avatar URLs like assigned users
+    (see UserSerializer). Querysets should ``select_related('user__userprofile')``.
+    """
 
-class CommentSerializer(serializers.ModelSerializer):
-    """Serializer for Comment model with read-only user and timestamp fields."""
+    author = UserSerializer(source='user', read_only=True)
 
     class Meta:
         model = Comment
-        fields = ['id', 'content', 'timestamp', 'task', 'user']
-        read_only_fields = ['user', 'timestamp']
+        fields = ['id', 'content', 'timestamp', 'updated_at', 'task', 'user', 'author']
+        read_only_fields = ['user', 'timestamp', 'updated_at']
+
+
+class TaskSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Serializer for Task model including assigned users and its most recent
+    comments.
+
+    ``comments`` holds at most ``TASK_DETAIL_COMMENT_WINDOW`` comments, newest
+    first, read from the prefetched ``recent_comments`` when available (see
+    ``TaskViewSet.get_queryset``). The full thread is paginated at
+    ``/api/tasks/{id}/comments/``.
+    """
+
+    assigned_users = UserSerializer(many=True, read_only=True)
+    comments = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Task
+        exclude = ['search_vector']
+        read_only_fields = ['comment_count', 'last_activity_at']
 
+    def get_comments(self, obj):
+        recent = getattr(obj, 'recent_comments', None)
+        if recent is None:
+            recent = obj.comments.select_related('user__userprofile').order_by('-timestamp', '-id')[:comment_window()]
+        return CommentSerializer(recent, many=True).data
+
+
+class TaskListSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Lightweight Task representation for list responses.
+
+    Replaces the full comment thread with the comment count and the most
+    recent comment. Expects the queryset to prefetch ``latest_comments``
+    (see ``TaskViewSet.get_queryset``).
+    """
 
-class TaskSerializer(serializers.ModelSerializer):
-    """Serializer for Task model including assigned users and related comments."""
-    
     assigned_users = UserSerializer(many=True, read_only=True)
-    comments = CommentSerializer(many=True, read_only=True)
+    latest_comment = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'description', 'status', 'priority',
+            'assigned_users', 'created_at', 'updated_at', 'comment_count', 'last_activity_at', 'latest_comment',
+        ]
+        read_only_fields = ['comment_count', 'last_activity_at']
+
+    def get_latest_comment(self, obj):
+        latest = obj.latest_comments[0] if obj.latest_comments else None
+        return CommentSerializer(latest).data if latest else None
+
+
+class TaskBulkItemSerializer(serializers.ModelSerializer):
+    """
+    Validates a single item of a bulk create/update request.
+
+    ``assigned_users`` is taken as a plain list of user ids; their existence
+    is checked once for the whole batch (see ``core.bulk``) instead of one
+    query per item.
+    """
+
+    id = serializers.IntegerField(required=False)
+    assigned_users = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False
+    )
 
     class Meta:
         model = Task
-        fields = '__all__'
\ No newline at end of file
+        fields = ['id', 'title', 'description', 'status', 'priority', 'assigned_users']
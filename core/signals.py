@@ -1,9 +1,215 @@
-from django.db.models.signals import post_save
+from django.dispatch import Signal
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
 from django.contrib.auth.models import User
-from .models import UserProfile
+from .models import UserProfile, Task, Comment, Tombstone
+from .search import update_task_vectors, update_comment_vectors
+from .caching import invalidate_tasks
+from .authentication import user_cache
+from . import avatars, stats
+from .events import record_change
+
+# Sent once for a batch of tasks written with bulk_create/bulk_update/delete,
+# which bypass the per-row signals below. Arguments: task_ids, action.
+tasks_bulk_changed = Signal()
+# Same for comments. Arguments: comments (the Comment instances), action.
+comments_bulk_changed = Signal()
 
 def create_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
 
-post_save.connect(create_profile, sender=User)
\ No newline at end of file
+def refresh_task_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or {'title', 'description'} & set(update_fields):
+        update_task_vectors([instance.pk])
+
+def refresh_comment_search_vector(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'content' in update_fields:
+        update_comment_vectors([instance.pk])
+
+def invalidate_task_cache(sender, instance, **kwargs):
+    invalidate_tasks([instance.pk])
+
+def invalidate_comment_task_cache(sender, instance, **kwargs):
+    invalidate_tasks([instance.task_id])
+
+def invalidate_assignment_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # The affected tasks are unknown once a user's assignments are cleared
+        instance._cleared_task_ids = list(instance.tasks.values_list('pk', flat=True))
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        if not reverse:
+            invalidate_tasks([instance.pk])
+        elif action == 'post_clear':
+            invalidate_tasks(getattr(instance, '_cleared_task_ids', []))
+        else:
+            invalidate_tasks(pk_set)
+
+def invalidate_user_task_cache(sender, instance, created, update_fields=None, **kwargs):
+    # Task responses embed the username and email of assigned users
+    if created or (update_fields is not None and not {'username', 'email'} & set(update_fields)):
+        return
+    invalidate_tasks(instance.tasks.values_list('pk', flat=True))
+
+def refresh_bulk_changed_tasks(sender, task_ids, action, **kwargs):
+    if action != 'delete':
+        update_task_vectors(task_ids)
+    invalidate_tasks(task_ids)
+
+def refresh_bulk_changed_comments(sender, comments, action, **kwargs):
+    if action != 'delete':
+        update_comment_vectors([comment.pk for comment in comments])
+    invalidate_tasks({comment.task_id for comment in comments})
+
+def publish_task_change(sender, instance, created=False, **kwargs):
+    if kwargs['signal'] is post_delete:
+        record_change(instance.pk, task='deleted')
+    else:
+        record_change(instance.pk, task='created' if created else 'updated')
+
+def publish_comment_change(sender, instance, created=False, **kwargs):
+    if kwargs['signal'] is post_delete:
+        kind = 'deleted'
+    else:
+        kind = 'added' if created else 'edited'
+    record_change(instance.task_id, comments={kind: [instance.pk]})
+
+def publish_assignment_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        record_change(instance.pk, assignees=True)
+    else:
+        task_ids = getattr(instance, '_cleared_task_ids', []) if action == 'post_clear' else pk_set
+        for task_id in task_ids:
+            record_change(task_id, assignees=True)
+
+def publish_bulk_task_changes(sender, task_ids, action, **kwargs):
+    if action == 'create':
+        return  # Nobody can be subscribed to a task that did not exist yet
+    task = {'update': 'updated', 'delete': 'deleted'}[action]
+    for task_id in task_ids:
+        record_change(task_id, task=task, assignees=action == 'update')
+
+def publish_bulk_comment_changes(sender, comments, action, **kwargs):
+    kind = {'create': 'added', 'update': 'edited', 'delete': 'deleted'}[action]
+    by_task = {}
+    for comment in comments:
+        by_task.setdefault(comment.task_id, []).append(comment.pk)
+    for task_id, comment_ids in by_task.items():
+        record_change(task_id, comments={kind: comment_ids})
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk if sender is User else instance.user_id)
+
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        Task.objects.filter(pk=instance.task_id).comment_added(instance.timestamp)
+
+def uncount_comment(sender, instance, **kwargs):
+    Task.objects.filter(pk=instance.task_id).comment_removed()
+
+def recount_bulk_changed_comments(sender, comments, action, **kwargs):
+    if action != 'update':
+        Task.objects.filter(pk__in={comment.task_id for comment in comments}).refresh_activity()
+
+def touch_assigned_tasks(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        task_ids = [instance.pk]
+    else:
+        task_ids = getattr(instance, '_cleared_task_ids', []) if action == 'post_clear' else pk_set
+    Task.objects.filter(pk__in=task_ids).touch()
+
+def record_tombstone(sender, instance, **kwargs):
+    model = Tombstone.TASK if sender is Task else Tombstone.COMMENT
+    Tombstone.objects.create(model=model, object_id=instance.pk)
+
+def lock_task_stats(sender, instance, **kwargs):
+    # The stored key, not the one loaded with the instance: a concurrent save
+    # may have changed it since. The lock holds until Task.save() commits.
+    if not instance._state.adding:
+        stored = Task.objects.select_for_update().filter(pk=instance.pk).values_list('status', 'priority').first()
+        instance._stat_key = stored or (None, None)
+
+def track_task_stats(sender, instance, created, **kwargs):
+    key = (instance.status, instance.priority)
+    if created:
+        stats.apply_deltas(stats.task_keys(*key))
+    else:
+        before = instance.__dict__.pop('_stat_key', key)
+        if None not in before and before != key:
+            user_ids = list(instance.assigned_users.values_list('pk', flat=True))
+            stats.apply_deltas(stats.diff(stats.task_keys(*before, user_ids), stats.task_keys(*key, user_ids)))
+
+def untrack_task_stats(sender, instance, **kwargs):
+    # pre_delete: the task's assignments still exist
+    stats.apply_deltas(stats.snapshot([instance.pk]), sign=-1)
+
+def track_assignment_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    assignments = stats.Assignment.objects.filter(**{'user_id' if reverse else 'task_id': instance.pk})
+    if pk_set is not None:
+        assignments = assignments.filter(**{'task_id__in' if reverse else 'user_id__in': pk_set})
+    if action in ('pre_remove', 'pre_clear'):
+        # Only the pairs that actually exist are removed
+        instance._removed_stat_keys = stats.assignment_keys(assignments)
+    elif action in ('post_remove', 'post_clear'):
+        stats.apply_deltas(instance.__dict__.pop('_removed_stat_keys', {}), sign=-1)
+    elif action == 'post_add':
+        stats.apply_deltas(stats.assignment_keys(assignments))
+
+def process_avatar_upload(sender, instance, **kwargs):
+    name = instance.avatar.name or ''
+    if name == getattr(instance, '_avatar_name', ''):
+        return
+    instance._avatar_name = name
+    # Drop the previous avatar's variants now; the new ones are rendered in the background
+    stale = avatars.variant_paths(instance.avatar_variants)
+    if stale:
+        UserProfile.objects.filter(pk=instance.pk).update(avatar_variants={})
+        instance.avatar_variants = {}
+    if name or stale:
+        avatars.schedule(instance.pk, stale)
+    # Task responses embed the avatar URLs of assigned users
+    invalidate_tasks(instance.user.tasks.values_list('pk', flat=True))
+
+post_save.connect(create_profile, sender=User)
+post_save.connect(refresh_task_search_vector, sender=Task)
+post_save.connect(refresh_comment_search_vector, sender=Comment)
+
+post_save.connect(count_comment, sender=Comment)
+post_delete.connect(uncount_comment, sender=Comment)
+comments_bulk_changed.connect(recount_bulk_changed_comments, sender=Comment)
+
+pre_save.connect(lock_task_stats, sender=Task)
+post_save.connect(track_task_stats, sender=Task)
+pre_delete.connect(untrack_task_stats, sender=Task)
+m2m_changed.connect(track_assignment_stats, sender=Task.assigned_users.through)
+
+post_delete.connect(record_tombstone, sender=Task)
+post_delete.connect(record_tombstone, sender=Comment)
+
+post_save.connect(invalidate_task_cache, sender=Task)
+post_delete.connect(invalidate_task_cache, sender=Task)
+post_save.connect(invalidate_comment_task_cache, sender=Comment)
+post_delete.connect(invalidate_comment_task_cache, sender=Comment)
+m2m_changed.connect(invalidate_assignment_cache, sender=Task.assigned_users.through)
+m2m_changed.connect(touch_assigned_tasks, sender=Task.assigned_users.through)
+post_save.connect(invalidate_user_task_cache, sender=User)
+tasks_bulk_changed.connect(refresh_bulk_changed_tasks, sender=Task)
+comments_bulk_changed.connect(refresh_bulk_changed_comments, sender=Comment)
+
+post_save.connect(publish_task_change, sender=Task)
+post_delete.connect(publish_task_change, sender=Task)
+post_save.connect(publish_comment_change, sender=Comment)
+post_delete.connect(publish_comment_change, sender=Comment)
+m2m_changed.connect(publish_assignment_change, sender=Task.assigned_users.through)
+tasks_bulk_changed.connect(publish_bulk_task_changes, sender=Task)
+comments_bulk_changed.connect(publish_bulk_comment_changes, sender=Comment)
+
+post_save.connect(process_avatar_upload, sender=UserProfile)
+
+post_save.connect(invalidate_cached_user, sender=User)
+post_delete.connect(invalidate_cached_user, sender=User)
+post_save.connect(invalidate_cached_user, sender=UserProfile)
+post_delete.connect(invalidate_cached_user, sender=UserProfile)
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""
+Dashboard counts of tasks by status and priority, overall and per user.
+
+``TaskStat`` holds one row per (status, priority, user) with ``user`` null
+for the overall counts. Writes apply deltas to it instead of the dashboard
+running ``GROUP BY`` queries over ``Task`` and the ``assigned_users`` through
+table: per-row saves, deletes and assignment changes from
+``core/signals.py``, bulk writes by diffing ``snapshot`` before and after
+(see ``core/bulk.py``). ``compute`` and ``rebuild`` derive the same counts
+from scratch for the ``rebuild_task_stats`` command.
+"""
+
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Task, TaskStat
+
+Assignment = Task.assigned_users.through
+
+
+def assignment_keys(assignments):
+    """Count the (status, priority, user_id) keys of an Assignment queryset."""
+    return Counter(assignments.values_list('task__status', 'task__priority', 'user_id'))
+
+
+def task_keys(status, priority, user_ids=()):
+    """Keys counting one task in the overall row and in the rows of its assignees."""
+    keys = Counter({(status, priority, None): 1})
+    keys.update((status, priority, user_id) for user_id in user_ids)
+    return keys
+
+
+def snapshot(task_ids):
+    """Return the keys counted for the given tasks as they are now stored."""
+    keys = Counter(
+        (status, priority, None)
+        for status, priority in Task.objects.filter(pk__in=task_ids).values_list('status', 'priority')
+    )
+    keys.update(assignment_keys(Assignment.objects.filter(task_id__in=task_ids)))
+    return keys
+
+
+def diff(before, after):
+    return {key: after[key] - before[key] for key in before.keys() | after.keys() if after[key] != before[key]}
+
+
+def lock_order(item):
+    """Sort key of a (key, delta) item; the overall row (null user) sorts first."""
+    (status, priority, user_id), _ = item
+    return status, priority, user_id is not None, user_id or 0
+
+
+def apply_deltas(deltas, sign=1):
+    """Atomically add ``sign * delta`` to the count of every (status, priority, user_id) key."""
+    # Every writer locks the rows in the same order, so concurrent ones cannot deadlock
+    deltas = sorted(((key, sign * delta) for key, delta in deltas.items() if delta), key=lock_order)
+    if not deltas:
+        return
+    with transaction.atomic():
+        # Make sure every row exists, then update them all with F() expressions
+        TaskStat.objects.bulk_create([
+            TaskStat(status=status, priority=priority, user_id=user_id)
+            for (status, priority, user_id), _ in deltas
+        ], ignore_conflicts=True)
+        for (status, priority, user_id), delta in deltas:
+            TaskStat.objects.filter(status=status, priority=priority, user_id=user_id).update(
+                count=F('count') + delta
+            )
+
+
+def compute():
+    """Count every (status, priority, user_id) key from the tasks themselves."""
+    keys = Counter({
+        (row['status'], row['priority'], None): row['count']
+        for row in Task.objects.order_by().values('status', 'priority').annotate(count=Count('pk'))
+    })
+    keys.update({
+        (row['task__status'], row['task__priority'], row['user_id']): row['count']
+        for row in Assignment.objects.order_by().values('task__status', 'task__priority', 'user_id')
+        .annotate(count=Count('pk'))
+    })
+    return keys
+
+
+def stored():
+    return Counter({
+        (status, priority, user_id): count
+        for status, priority, user_id, count in TaskStat.objects.values_list('status', 'priority', 'user_id', 'count')
+        if count
+    })
+
+
+def check():
+    """Return ``{key: (stored, expected)}`` for every count that has drifted."""
+    expected, actual = compute(), stored()
+    return {
+        key: (actual[key], expected[key])
+        for key in expected.keys() | actual.keys() if actual[key] != expected[key]
+    }
+
+
+def rebuild():
+    """Replace the stored counts with freshly computed ones; return the number of rows."""
+    with transaction.atomic():
+        keys = compute()
+        TaskStat.objects.all().delete()
+        TaskStat.objects.bulk_create([
+            TaskStat(status=status, priority=priority, user_id=user_id, count=count)
+            for (status, priority, user_id), count in keys.items()
+        ], batch_size=1000)
+    return len(keys)
+
+
+def summary(user_id=None):
+    """
+    Return the counts for all tasks (or those assigned to ``user_id``) as
+    totals by status and by priority plus the full status x priority matrix.
+    """
+    counts = dict(
+        ((status, priority), count)
+        for status, priority, count in TaskStat.objects.filter(user_id=user_id).values_list('status', 'priority', 'count')
+    )
+    statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+    priorities = [choice for choice, _ in Task.PRIORITY_CHOICES]
+    matrix = {
+        status: {priority: counts.get((status, priority), 0) for priority in priorities}
+        for status in statuses
+    }
+    return {
+        'total': sum(counts.values()),
+        'by_status': {status: sum(row.values()) for status, row in matrix.items()},
+        'by_priority': {priority: sum(matrix[status][priority] for status in statuses) for priority in priorities},
+        'by_status_and_priority': matrix,
+    }
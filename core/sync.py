@@ -0,0 +1,168 @@
+"""
+Delta sync for the ``/api/tasks/changes/`` endpoint.
+
+Clients pass the opaque token from their previous sync and receive only the
+tasks and comments whose ``updated_at`` moved past it, plus the ids of the
+deleted ones (``Tombstone`` rows). Each of the three streams is read with a
+keyset over its ``(updated_at, id)`` / ``(deleted_at, id)`` index, so a sync
+costs the number of changes, not the size of the tables.
+
+The token is the URL-safe base64 encoding of the last position returned per
+stream. ``updated_at`` is stamped when a row is written, not when its
+transaction commits, so a row may become visible behind a position a
+client already holds. Rows newer than ``TASK_CHANGES_LAG_SECONDS``
+(default 10) are therefore held back until the next sync, and every
+multi-row write of synced rows runs in ``bounded_write``, which rolls the
+transaction back if it takes longer than ``TASK_CHANGES_MAX_WRITE_SECONDS``
+(default half the lag). Keep the lag well above that bound.
+
+Tombstones are kept for ``TASK_CHANGES_TOMBSTONE_DAYS`` (default 30) and
+then deleted by the ``prune_tombstones`` command, run periodically (e.g.
+daily from cron). The token also records how far the client has seen the deletions; a token
+that falls behind the retention window raises ``ExpiredToken``, because
+deletions it has not seen may be gone, and the client must start over with
+a full sync.
+"""
+
+import base64
+import binascii
+import json
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Tombstone
+
+STREAMS = ('tasks', 'comments', 'deleted')
+
+
+class InvalidToken(ValueError):
+    """Raised for a sync token that was not issued by ``encode_token``."""
+
+
+class ExpiredToken(ValueError):
+    """Raised for a sync token older than the tombstone retention window."""
+
+
+class WriteTooSlow(RuntimeError):
+    """Raised, rolling the transaction back, by a ``bounded_write`` that took too long."""
+
+
+def sync_lag():
+    return timedelta(seconds=getattr(settings, 'TASK_CHANGES_LAG_SECONDS', 10))
+
+
+def max_write_time():
+    seconds = getattr(settings, 'TASK_CHANGES_MAX_WRITE_SECONDS', None)
+    return sync_lag() / 2 if seconds is None else timedelta(seconds=seconds)
+
+
+@contextmanager
+def bounded_write():
+    """
+    A transaction for writing many synced rows, rolled back with
+    ``WriteTooSlow`` unless it is ready to commit within ``max_write_time``.
+    Rows it stamps are then visible before a sync can have passed them.
+    The bound only covers this block, so don't nest it in a longer transaction.
+    """
+    limit = max_write_time().total_seconds()
+    started = time.monotonic()
+    with transaction.atomic():
+        yield
+        elapsed = time.monotonic() - started
+        if elapsed > limit:
+            raise WriteTooSlow(f'write took {elapsed:.1f}s, more than the {limit:g}s allowed for synced rows')
+
+
+def tombstone_retention():
+    return timedelta(days=getattr(settings, 'TASK_CHANGES_TOMBSTONE_DAYS', 30))
+
+
+def prune_tombstones():
+    """Delete the tombstones older than the retention window; return how many."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()
+    return deleted
+
+
+def encode_token(positions):
+    data = json.dumps(positions, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip('=')
+
+
+def decode_token(token):
+    """
+    Return the per-stream positions of ``token``, and under ``seen`` the
+    moment up to which it has seen the deletions; an empty token starts
+    from scratch.
+    """
+    if not token:
+        return {}
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidToken(token)
+    if not isinstance(positions, dict) or not set(positions) <= {*STREAMS, 'seen'}:
+        raise InvalidToken(token)
+    for name, position in positions.items():
+        if name == 'seen':
+            if not isinstance(position, str) or parse_datetime(position) is None:
+                raise InvalidToken(token)
+            continue
+        if not (isinstance(position, list) and len(position) == 2 and isinstance(position[1], int)):
+            raise InvalidToken(token)
+        if not isinstance(position[0], str) or parse_datetime(position[0]) is None:
+            raise InvalidToken(token)
+    # Tokens issued before tombstones were pruned do not say what they have seen
+    if 'seen' not in positions or parse_datetime(positions['seen']) < timezone.now() - tombstone_retention():
+        raise ExpiredToken(token)
+    return positions
+
+
+def _after(queryset, field, position):
+    if position is None:
+        return queryset
+    moment, pk = parse_datetime(position[0]), position[1]
+    return queryset.filter(Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'pk__gt': pk}))
+
+
+def changes_since(token, limit, tasks, comments):
+    """
+    Return ``(changes, next_token, has_more)`` for the changes after ``token``.
+
+    ``changes`` maps ``tasks`` and ``comments`` to at most ``limit`` changed
+    instances from the given querysets, and ``deleted`` to at most ``limit``
+    tombstones, each oldest change first. ``has_more`` is True when a stream
+    was cut off by the limit and the client should sync again right away.
+    Raise ``InvalidToken`` or ``ExpiredToken`` for a token that cannot be
+    resumed.
+    """
+    positions = decode_token(token)
+    until = timezone.now() - sync_lag()
+    # An initial sync needs no deletions from before it started
+    seen = parse_datetime(positions.pop('seen')) if positions else until
+    changes = {}
+    has_more = False
+    for name, queryset, field in (
+        ('tasks', tasks, 'updated_at'),
+        ('comments', comments, 'updated_at'),
+        ('deleted', Tombstone.objects.all(), 'deleted_at'),
+    ):
+        queryset = _after(queryset, field, positions.get(name)).filter(**{f'{field}__lte': until})
+        rows = list(queryset.order_by(field, 'pk')[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            has_more = True
+            if name == 'deleted':
+                seen = max(seen, rows[-1].deleted_at)
+        elif name == 'deleted':
+            seen = until
+        if rows:
+            positions[name] = [getattr(rows[-1], field).isoformat(), rows[-1].pk]
+        changes[name] = rows
+    return changes, encode_token({**positions, 'seen': seen.isoformat()}), has_more
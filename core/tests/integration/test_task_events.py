@@ -0,0 +1,54 @@
+import json
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core import events
+from core.models import Task
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@override_settings(
+    CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+    TASK_EVENTS_COALESCE_SECONDS=0,
+)
+class TaskChangeEventTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='publisher', password='publisherpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+        self.task = Task.objects.create(title="Watched", description="desc", status="Not Started", priority="Low")
+
+        self.layer = get_channel_layer()
+        self.channel = async_to_sync(self.layer.new_channel)()
+        async_to_sync(self.layer.group_add)(f"task_{self.task.id}", self.channel)
+
+    def receive(self):
+        message = json.loads(async_to_sync(self.layer.receive)(self.channel)["text"])
+        self.assertIsInstance(message.pop("seq"), int)
+        return message
+
+    def test_rest_writes_are_published_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/comments/", {"task": self.task.id, "content": "Hi"})
+        self.assertEqual(self.receive(), {
+            "event": "task_changed",
+            "task_id": self.task.id,
+            "comments": {"added": [response.data["data"]["id"]]},
+        })
+
+    @override_settings(TASK_EVENTS_COALESCE_SECONDS=60)
+    def test_rapid_changes_are_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(f"/api/tasks/{self.task.id}/", {
+                "title": "Renamed", "description": "desc", "status": "In Progress", "priority": "Low",
+            })
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.assigned_users.add(self.user)
+        events.flush()
+        self.assertEqual(self.receive(), {
+            "event": "task_changed", "task_id": self.task.id, "task": "updated", "assignees": True,
+        })
@@ -0,0 +1,51 @@
+import pytest
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from core.events import task_event
+from core.routing import websocket_urlpatterns
+
+application = URLRouter(websocket_urlpatterns)
+
+
+@pytest.fixture
+def multiplex(settings):
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    settings.TASK_WS_MAX_SUBSCRIPTIONS = 3
+    return settings
+
+
+@pytest.mark.asyncio
+async def test_updates_for_subscribed_tasks_share_one_connection(multiplex):
+    communicator = WebsocketCommunicator(application, "/ws/tasks/")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    await communicator.send_json_to({"action": "subscribe", "task_ids": [1, 2]})
+    assert await communicator.receive_json_from() == {"event": "subscriptions", "task_ids": [1, 2]}
+
+    layer = get_channel_layer()
+    await layer.group_send("task_2", {"type": "task_update", "task_id": 2, "message": {"event": "ping"}})
+    assert await communicator.receive_json_from() == {"task_id": 2, "message": {"event": "ping"}}
+
+    await layer.group_send("task_1", task_event(1, '{"event":"pre-encoded"}'))
+    assert await communicator.receive_from() == '{"task_id":1,"message":{"event":"pre-encoded"}}'
+
+    await communicator.send_json_to({"action": "unsubscribe", "task_ids": [2]})
+    assert await communicator.receive_json_from() == {"event": "subscriptions", "task_ids": [1]}
+    await layer.group_send("task_2", {"type": "task_update", "task_id": 2, "message": {"event": "ping"}})
+    assert await communicator.receive_nothing(timeout=0.1)
+
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_subscription_limit(multiplex):
+    communicator = WebsocketCommunicator(application, "/ws/tasks/")
+    await communicator.connect()
+
+    await communicator.send_json_to({"action": "subscribe", "task_ids": [1, 2, 3, 4]})
+    response = await communicator.receive_json_from()
+    assert "limit" in response["error"]
+
+    await communicator.disconnect()
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from core.routing import websocket_urlpatterns
+
+application = URLRouter(websocket_urlpatterns)
+
+
+@pytest.fixture
+def outbound(settings):
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    settings.TASK_WS_OUTBOUND = {"FLUSH_INTERVAL": 0.05, "MAX_BATCH": 50, "MAX_QUEUE": 3}
+    return settings
+
+
+async def broadcast(task_id, count):
+    layer = get_channel_layer()
+    for i in range(count):
+        await layer.group_send(f"task_{task_id}", {"type": "task_update", "message": {"n": i}})
+
+
+@pytest.mark.asyncio
+async def test_burst_is_sent_as_one_batch(outbound):
+    communicator = WebsocketCommunicator(application, "/ws/task/1/")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    await broadcast(1, 3)
+    frame = json.loads(await communicator.receive_from())
+    assert frame == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_overflow_collapses_to_resync(outbound):
+    outbound.TASK_WS_OUTBOUND = {**outbound.TASK_WS_OUTBOUND, "OVERFLOW": "resync"}
+    communicator = WebsocketCommunicator(application, "/ws/task/2/")
+    await communicator.connect()
+
+    await broadcast(2, 5)
+    frame = json.loads(await communicator.receive_from())
+    assert frame == [{"event": "resync"}, {"n": 3}, {"n": 4}]
+
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_overflow_disconnects_slow_client(outbound):
+    outbound.TASK_WS_OUTBOUND = {**outbound.TASK_WS_OUTBOUND, "OVERFLOW": "disconnect"}
+    communicator = WebsocketCommunicator(application, "/ws/task/3/")
+    await communicator.connect()
+
+    await broadcast(3, 4)
+    output = await communicator.receive_output()
+    assert output == {"type": "websocket.close", "code": 1013}
@@ -0,0 +1,55 @@
+import pytest
+from django.core.cache import cache
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from core import eventlog
+from core.routing import websocket_urlpatterns
+
+application = URLRouter(websocket_urlpatterns)
+
+
+@pytest.fixture
+def event_log(settings):
+    settings.CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+    settings.TASK_EVENT_LOG_SIZE = 4
+    cache.clear()
+    for i in range(6):
+        eventlog.append(9, {"n": i})
+    # The number before the first event
+    return eventlog.current_seq(9) - 6
+
+
+@pytest.mark.asyncio
+async def test_reconnect_receives_only_missed_events(event_log):
+    communicator = WebsocketCommunicator(application, f"/ws/task/9/?last_seq={event_log + 4}")
+    connected, _ = await communicator.connect()
+    assert connected
+
+    assert await communicator.receive_json_from() == [{"n": 4, "seq": event_log + 5}, {"n": 5, "seq": event_log + 6}]
+
+    await communicator.send_json_to({"event": "typing"})
+    assert await communicator.receive_json_from() == {"event": "typing", "seq": event_log + 7}
+
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_evicted_gap_requires_resync(event_log):
+    communicator = WebsocketCommunicator(application, "/ws/task/9/")
+    await communicator.connect()
+
+    await communicator.send_json_to({"action": "resume", "last_seq": event_log + 1})
+    assert await communicator.receive_json_from() == {"event": "resync", "seq": event_log + 6}
+
+    await communicator.disconnect()
+
+
+def test_evicted_counter_keeps_numbers_increasing(event_log):
+    last_seq = eventlog.current_seq(9)
+    cache.delete(eventlog._seq_key(9))
+
+    text = eventlog.append(9, {"n": 6})
+    assert eventlog.current_seq(9) > last_seq
+    assert str(eventlog.current_seq(9)) in text
+    # The events between last_seq and the reset are lost: resync
+    assert eventlog.since(9, last_seq) is None
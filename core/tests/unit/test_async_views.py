@@ -0,0 +1,118 @@
+from django.core.cache import cache
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.authentication import user_cache
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class AsyncViewsTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.user = User.objects.create_user(username='async', password='asyncpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", description="desc", status="Not Started", priority="Low")
+            for i in range(5)
+        ]
+        self.tasks[0].assigned_users.add(self.user)
+        self.comment = Comment.objects.create(task=self.tasks[0], user=self.user, content="First")
+
+    def test_task_list_matches_sync_view(self):
+        response = self.client.get("/api/async/tasks/", {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        expected = self.client.get("/api/tasks/", {"page_size": 2}).json()
+        self.assertEqual(response.json()["results"], expected["results"])
+
+        seen = [task["id"] for task in response.json()["results"]]
+        next_url = response.json()["next"]
+        self.assertIn("/api/async/tasks/", next_url)
+        while next_url:
+            page = self.client.get(next_url).json()
+            seen.extend(task["id"] for task in page["results"])
+            next_url = page["next"]
+        self.assertEqual(seen, [task.id for task in reversed(self.tasks)])
+
+    def test_task_list_pages_through_ties(self):
+        # Every task has comment_count 0 but the first
+        pages = [self.client.get("/api/async/tasks/", {"ordering": "comment_count", "page_size": 2}).json()]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).json())
+        seen = [task["id"] for page in pages for task in page["results"]]
+        self.assertEqual(seen, [task.id for task in self.tasks[1:]] + [self.tasks[0].id])
+
+    def test_task_list_filters(self):
+        response = self.client.get("/api/async/tasks/", {"assignee": self.user.id})
+        self.assertEqual([task["id"] for task in response.json()["results"]], [self.tasks[0].id])
+
+        response = self.client.get("/api/async/tasks/", {"status": "Unknown"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+
+    def test_task_retrieve_matches_sync_view(self):
+        response = self.client.get(f"/api/async/tasks/{self.tasks[0].id}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get(f"/api/tasks/{self.tasks[0].id}/").json())
+
+        etag = response["ETag"]
+        response = self.client.get(f"/api/async/tasks/{self.tasks[0].id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.assertEqual(self.client.get("/api/async/tasks/999999/").status_code, 404)
+        self.assertEqual(self.client.get("/api/async/tasks/abc/").status_code, 404)
+
+    def test_padded_lookup_is_invalidated(self):
+        padded = f"/api/async/tasks/00{self.tasks[0].id}/"
+        etag = self.client.get(padded)["ETag"]
+
+        self.client.patch(f"/api/tasks/{self.tasks[0].id}/", {"title": "Edited"}, format="json")
+
+        response = self.client.get(padded, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Edited")
+
+    def test_task_create(self):
+        response = self.client.post("/api/async/tasks/", {
+            "title": "Async Task", "description": "desc", "status": "In Progress", "priority": "High",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["message"], "Task is successfully created")
+        self.assertEqual(response.json()["data"]["title"], "Async Task")
+        self.assertEqual(response.json()["data"]["comments"], [])
+        self.assertTrue(Task.objects.filter(title="Async Task").exists())
+
+        response = self.client.post("/api/async/tasks/", {"title": ""}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_comment_endpoints(self):
+        response = self.client.post("/api/async/comments/", {
+            "task": self.tasks[1].id, "content": "Async comment",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["message"], "Comment is successfully created")
+        self.assertEqual(response.json()["data"]["user"], self.user.id)
+        self.assertEqual(response.json()["data"]["author"]["username"], "async")
+        self.tasks[1].refresh_from_db()
+        self.assertEqual(self.tasks[1].comment_count, 1)
+
+        response = self.client.get("/api/async/comments/", {"task": self.tasks[0].id})
+        self.assertEqual([comment["id"] for comment in response.json()["results"]], [self.comment.id])
+
+        response = self.client.get(f"/api/async/comments/{self.comment.id}/")
+        self.assertEqual(response.json(), self.client.get(f"/api/comments/{self.comment.id}/").json())
+
+        response = self.client.post("/api/async/comments/", {"task": 999999, "content": "x"}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get("/api/async/tasks/")
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("WWW-Authenticate", response)
+
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer invalid")
+        self.assertEqual(self.client.get("/api/async/comments/").status_code, 401)
@@ -0,0 +1,28 @@
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.authentication import user_cache
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(username='cached', password='cachedpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+    def test_user_lookup_is_cached(self):
+        self.client.get("/api/comments/")
+        with self.assertNumQueries(1):  # only the comment page itself
+            response = self.client.get("/api/comments/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(user_cache.stats()["hits"], 1)
+        self.assertEqual(user_cache.stats()["misses"], 1)
+
+    def test_deactivation_invalidates_cache(self):
+        self.client.get("/api/comments/")
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get("/api/comments/")
+        self.assertEqual(response.status_code, 401)
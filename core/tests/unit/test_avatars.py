@@ -0,0 +1,103 @@
+import shutil
+import tempfile
+from unittest import mock
+from io import BytesIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core import avatars
+from core.models import Comment, Task, UserProfile
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+def upload(name='face.png', size=(300, 200)):
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+class AvatarVariantsTestCase(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user(username='face', password='facepass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def set_avatar(self, file, execute=False):
+        profile = UserProfile.objects.get(user=self.user)
+        profile.avatar = file
+        with self.captureOnCommitCallbacks(execute=execute):
+            profile.save()
+        return profile
+
+    def test_upload_schedules_rendering(self):
+        with mock.patch.object(avatars, 'get_executor') as get_executor:
+            profile = self.set_avatar(upload(), execute=True)
+            get_executor.return_value.submit.assert_called_once_with(avatars.run_in_worker, profile.pk, [])
+
+            # Saving again without a new upload does not render again
+            profile = UserProfile.objects.get(user=self.user)
+            with self.captureOnCommitCallbacks(execute=True):
+                profile.save()
+            get_executor.return_value.submit.assert_called_once()
+
+    def test_variants_are_rendered_and_exposed(self):
+        profile = self.set_avatar(upload())
+        variants = avatars.generate_variants(profile.pk)
+
+        self.assertEqual(set(variants), {'small', 'medium', 'large'})
+        with default_storage.open(variants['small']['webp']) as small:
+            image = Image.open(small)
+            self.assertEqual((image.format, image.size), ('WEBP', (32, 32)))
+
+        task = Task.objects.create(title="Faces", description="desc", status="Not Started", priority="Low")
+        task.assigned_users.add(self.user)
+        assignee = self.client.get("/api/tasks/").data["results"][0]["assigned_users"][0]
+        self.assertTrue(assignee["avatar"].endswith('.png'))
+        self.assertEqual(assignee["avatar_variants"]["small"]["jpeg"], default_storage.url(variants['small']['jpeg']))
+
+        Comment.objects.create(task=task, user=self.user, content="Hi")
+        other = User.objects.create_user(username='other', password='otherpass')
+        Comment.objects.create(task=task, user=other, content="Hello")
+        self.client.get("/api/comments/")
+        with self.assertNumQueries(1):  # authors and profiles come with the comment page
+            comments = self.client.get("/api/comments/").data["results"]
+        authors = {comment["author"]["username"]: comment["author"] for comment in comments}
+        self.assertEqual(authors["face"]["avatar_variants"]["small"]["webp"], default_storage.url(variants['small']['webp']))
+        self.assertEqual(authors["other"]["avatar_variants"], {})
+        latest = self.client.get(f"/api/tasks/{task.id}/").data["comments"][0]
+        self.assertEqual(latest["author"]["username"], "other")
+
+    def test_replacing_avatar_discards_old_variants(self):
+        profile = self.set_avatar(upload())
+        old = avatars.variant_paths(avatars.generate_variants(profile.pk))
+
+        profile = UserProfile.objects.get(pk=profile.pk)
+        profile.avatar = upload('other.png')
+        with self.captureOnCommitCallbacks(execute=False):
+            profile.save()
+        self.assertEqual(UserProfile.objects.get(pk=profile.pk).avatar_variants, {})
+
+        # process() leaves the connections alone, unlike the worker wrapper
+        avatars.process(profile.pk, old)
+        self.assertFalse(any(default_storage.exists(path) for path in old))
+        self.assertIn('other', UserProfile.objects.get(pk=profile.pk).avatar_variants['large']['webp'])
+
+    def test_worker_closes_its_connections(self):
+        with mock.patch.object(avatars, 'process') as process, \
+                mock.patch.object(avatars, 'connections') as connections:
+            process.side_effect = RuntimeError
+            with self.assertRaises(RuntimeError):
+                avatars.run_in_worker(1, [])
+            connections.close_all.assert_called_once_with()
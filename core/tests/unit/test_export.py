@@ -0,0 +1,39 @@
+import json
+
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class ExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='exporter', password='exporterpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+        self.high = Task.objects.create(title="High", description="desc", status="Not Started", priority="High")
+        self.low = Task.objects.create(title="Low", description="desc", status="Not Started", priority="Low")
+        self.high.assigned_users.add(self.user)
+        Comment.objects.create(task=self.high, user=self.user, content="Hello, world")
+
+    def test_ndjson_task_export_with_filters(self):
+        response = self.client.get("/api/tasks/export/", {"priority": "High"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["id"], self.high.id)
+        self.assertEqual(rows[0]["assigned_users"], [self.user.id])
+
+    def test_csv_comment_export(self):
+        response = self.client.get("/api/comments/export/", {"output": "csv", "task": self.high.id})
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,task_id,user_id,content,timestamp")
+        self.assertIn('"Hello, world"', lines[1])
+
+    def test_unknown_output_format(self):
+        response = self.client.get("/api/tasks/export/", {"output": "xml"})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+
+class StubGitHub(BaseHTTPRequestHandler):
+    """Local stand-in for the GitHub token and user endpoints."""
+
+    calls = []
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.calls.append(self.path)
+        if self.path == '/slow/login/oauth/access_token':
+            time.sleep(0.5)
+        self.reply({} if self.path.startswith('/broken/') else {'access_token': 'stub-token'})
+
+    def do_GET(self):
+        self.calls.append(self.path)
+        if self.headers['Authorization'] != 'token stub-token':
+            self.reply({'message': 'Bad credentials'})
+        else:
+            self.reply({'id': 1, 'login': 'octocat', 'email': None})
+
+    def reply(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except BrokenPipeError:
+            pass  # the client gave up waiting
+
+    def log_message(self, *args):
+        pass
+
+
+class GitHubAuthTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubGitHub)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        StubGitHub.calls = []
+
+    def github(self, prefix='', read_timeout=5):
+        return override_settings(GITHUB_HTTP={
+            'TOKEN_URL': f'{self.base_url}{prefix}/login/oauth/access_token',
+            'USER_URL': f'{self.base_url}/user',
+            'READ_TIMEOUT': read_timeout,
+        })
+
+    def test_login_creates_user_and_caches_profile(self):
+        with self.github():
+            response = self.client.post('/auth/github/', {'code': 'abc'}, content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['user'], {'username': 'octocat', 'email': 'octocat@github.com'})
+            self.assertTrue(User.objects.filter(username='octocat').exists())
+
+            self.client.post('/auth/github/', {'code': 'def'})
+        self.assertEqual(StubGitHub.calls.count('/user'), 1)
+
+    def test_missing_code(self):
+        response = self.client.post('/auth/github/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Code not provided'})
+
+    def test_token_exchange_failure(self):
+        with self.github(prefix='/broken'):
+            response = self.client.post('/auth/github/', {'code': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Failed to get access token'})
+
+    def test_slow_github_times_out(self):
+        with self.github(prefix='/slow', read_timeout=0.1):
+            response = self.client.post('/auth/github/', {'code': 'abc'})
+        self.assertEqual(response.status_code, 504)
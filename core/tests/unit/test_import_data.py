@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from core.models import Task, Comment, UserProfile
+
+
+class ImportDataCommandTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.alice = User.objects.create_user(username='alice', password='alicepass')
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as handle:
+            handle.write(content)
+        return path
+
+    def test_import_tasks_and_comments(self):
+        tasks = self.write('tasks.ndjson', "\n".join(json.dumps(row) for row in [
+            {"id": 10, "title": "One", "description": "d", "status": "Not Started", "priority": "Low",
+             "created_at": "2024-01-02T03:04:05+00:00", "assigned_users": ["alice", "carol"]},
+            {"id": 11, "title": "Two", "description": "d", "status": "Done", "priority": "Low"},
+            {"id": 12, "title": "Three", "description": "d", "status": "Completed", "priority": "High"},
+        ]))
+        out = StringIO()
+        call_command('import_data', 'tasks', tasks, batch_size=2, stdout=out, stderr=StringIO())
+
+        self.assertEqual(sorted(Task.objects.values_list('id', flat=True)), [10, 12])
+        self.assertEqual(Task.objects.get(pk=10).created_at.year, 2024)
+        self.assertEqual(Task.objects.get(pk=10).last_activity_at, Task.objects.get(pk=10).created_at)
+        carol = User.objects.get(username='carol')
+        self.assertTrue(UserProfile.objects.filter(user=carol).exists())
+        self.assertEqual(set(Task.objects.get(pk=10).assigned_users.all()), {self.alice, carol})
+        self.assertIn('rows/s', out.getvalue())
+
+        comments = self.write('comments.csv', "task,user,content\n10,alice,First\n12,bob,Second\n")
+        call_command('import_data', 'comments', comments, stdout=StringIO())
+        self.assertEqual(Comment.objects.count(), 2)
+        self.assertTrue(User.objects.filter(username='bob').exists())
+
+    def test_resume_from_checkpoint(self):
+        first = Task.objects.create(title="First", description="d", status="Not Started", priority="Low")
+        second = Task.objects.create(title="Second", description="d", status="Not Started", priority="Low")
+        assignments = self.write('assignments.csv', f"task,user\n{first.id},alice\n{second.id},alice\n")
+        with open(assignments + '.checkpoint', 'w') as checkpoint:
+            json.dump({"kind": "assignments", "rows": 1}, checkpoint)
+
+        call_command('import_data', 'assignments', assignments, stdout=StringIO())
+
+        self.assertEqual(list(self.alice.tasks.all()), [second])
+        # Visible to /api/tasks/changes/
+        self.assertGreater(Task.objects.get(pk=second.pk).updated_at, second.updated_at)
+        self.assertEqual(Task.objects.get(pk=first.pk).updated_at, first.updated_at)
+        with open(assignments + '.checkpoint') as checkpoint:
+            self.assertEqual(json.load(checkpoint)["rows"], 2)
+
+    def test_corrupt_lines_are_skipped(self):
+        tasks = self.write('tasks.ndjson', "\n".join([
+            json.dumps({"id": 20, "title": "Kept", "description": "d", "status": "Not Started", "priority": "Low"}),
+            '{"id": 21, "title": "Cut off',
+            json.dumps({"id": 22, "title": "Also kept", "description": "d", "status": "Completed", "priority": "Low"}),
+        ]))
+        out, err = StringIO(), StringIO()
+        call_command('import_data', 'tasks', tasks, stdout=out, stderr=err)
+
+        self.assertEqual(sorted(Task.objects.values_list('id', flat=True)), [20, 22])
+        self.assertIn('Row 2 skipped: invalid JSON', err.getvalue())
+        self.assertIn('Imported 2 tasks (1 skipped', out.getvalue())
+        with open(tasks + '.checkpoint') as checkpoint:
+            self.assertEqual(json.load(checkpoint)["rows"], 3)
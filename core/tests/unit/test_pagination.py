@@ -0,0 +1,123 @@
+import base64
+import json
+from unittest import mock
+from urllib.parse import urlencode
+
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task, Comment
+from core.pagination import TaskCursorPagination
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class CursorPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='pager', password='pagerpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+        self.tasks = [
+            Task.objects.create(title=f"Task {i}", description="desc", status="Not Started", priority="Low")
+            for i in range(7)
+        ]
+
+    def test_task_pages_are_stable_across_inserts(self):
+        response = self.client.get("/api/tasks/", {"page_size": 3})
+        self.assertEqual(response.status_code, 200)
+        seen = [task["id"] for task in response.data["results"]]
+
+        # A task created while paging must not shift the following pages
+        Task.objects.create(title="Late Task", description="desc", status="Not Started", priority="Low")
+
+        next_url = response.data["next"]
+        while next_url:
+            response = self.client.get(next_url)
+            seen.extend(task["id"] for task in response.data["results"])
+            next_url = response.data["next"]
+
+        expected = [task.id for task in sorted(self.tasks, key=lambda t: (t.created_at, t.id), reverse=True)]
+        self.assertEqual(seen, expected)
+
+    def collect(self, url, params):
+        response = self.client.get(url, params)
+        pages = [response.data]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+        return pages
+
+    def test_ties_are_paged_past_offset_cutoff(self):
+        Task.objects.bulk_create([
+            Task(title="Tie", description="desc", status="Not Started", priority="Low") for _ in range(13)
+        ])
+        expected = sorted(Task.objects.values_list("id", flat=True), reverse=True)
+
+        # DRF cursors would keep repeating the first pages once the ties exceed the cutoff
+        with mock.patch.object(TaskCursorPagination, "offset_cutoff", 3):
+            for ordering in ("-comment_count", "title"):
+                pages = self.collect("/api/tasks/", {"ordering": ordering, "page_size": 4})
+                seen = [task["id"] for page in pages for task in page["results"]]
+                self.assertEqual(len(pages), 5)
+                self.assertEqual(sorted(seen, reverse=True), expected)
+                self.assertEqual(len(seen), len(set(seen)))
+
+    def test_tampered_cursor_is_not_found(self):
+        for ordering, position in [
+            ("-created_at", ["yesterday", 1]),
+            ("-comment_count", ["many", 1]),
+            ("-created_at", [None, None]),
+            ("title", [{"a": 1}, "x"]),
+        ]:
+            cursor = base64.b64encode(urlencode({"p": json.dumps(position)}).encode()).decode()
+            for url in ("/api/tasks/", "/api/async/tasks/"):
+                response = self.client.get(url, {"ordering": ordering, "cursor": cursor})
+                self.assertEqual(response.status_code, 404, (url, ordering, position))
+
+    def test_previous_link_returns_the_prior_page(self):
+        first = self.client.get("/api/tasks/", {"page_size": 3, "ordering": "-comment_count"})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+
+    def test_comment_list_is_paginated(self):
+        for i in range(4):
+            Comment.objects.create(task=self.tasks[0], user=self.user, content=f"Comment {i}")
+
+        response = self.client.get("/api/comments/", {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_task_comments_are_paginated(self):
+        comments = [
+            Comment.objects.create(task=self.tasks[0], user=self.user, content=f"Comment {i}")
+            for i in range(5)
+        ]
+        Comment.objects.create(task=self.tasks[1], user=self.user, content="Elsewhere")
+
+        seen = []
+        next_url = f"/api/tasks/{self.tasks[0].id}/comments/?page_size=2"
+        while next_url:
+            response = self.client.get(next_url)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(comment["id"] for comment in response.data["results"])
+            next_url = response.data["next"]
+
+        self.assertEqual(seen, [comment.id for comment in reversed(comments)])
+        self.assertEqual(self.client.get("/api/tasks/999999/comments/").status_code, 404)
+
+    def test_task_comments_ignore_task_ordering(self):
+        comments = [
+            Comment.objects.create(task=self.tasks[0], user=self.user, content=f"Comment {i}")
+            for i in range(3)
+        ]
+        for ordering in ("title", "-comment_count", "last_activity_at"):
+            response = self.client.get(f"/api/tasks/{self.tasks[0].id}/comments/", {"ordering": ordering})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [comment["id"] for comment in response.data["results"]],
+                [comment.id for comment in reversed(comments)],
+            )
@@ -0,0 +1,104 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase, APIClient
+
+from core import hashing
+from core.models import UserProfile
+
+
+class PasswordHashingTestCase(APITestCase):
+    def setUp(self):
+        hashing.pool.reset_stats()
+        self.user = User.objects.create_user(username='hasher', password='hashpass')
+        self.client = APIClient()
+
+    def test_login_verifies_on_pool(self):
+        response = self.client.post("/auth/login/", {"username": "hasher", "password": "hashpass"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+        self.assertEqual(response.json()["user"]["username"], "hasher")
+        self.assertEqual(hashing.pool.stats()["completed"], 1)
+
+        response = self.client.post("/auth/login/", {"username": "hasher", "password": "wrong"}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+        response = self.client.post("/auth/login/", {"username": "hasher"}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", response.json())
+
+    def test_jwt_create_verifies_on_pool(self):
+        response = self.client.post("/auth/jwt/create/", {"username": "hasher", "password": "wrong"}, format="json")
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post("/auth/jwt/create/", {"username": "hasher", "password": "hashpass"}, format="json")
+        self.assertIn("access", response.json())
+        self.assertEqual(hashing.pool.stats()["completed"], 2)
+
+    def test_failed_authenticate_hashes_once_on_pool(self):
+        with mock.patch.object(User, "check_password") as check_password:
+            self.assertIsNone(authenticate(username="hasher", password="wrong"))
+            self.assertIsNone(authenticate(username="nobody", password="wrong"))
+        check_password.assert_not_called()
+        self.assertEqual(hashing.pool.stats()["completed"], 2)
+
+    def test_unknown_user_still_hashes(self):
+        response = self.client.post("/auth/login/", {"username": "nobody", "password": "x"}, format="json")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(hashing.pool.stats()["completed"], 1)
+
+    def test_registration_hashes_on_pool(self):
+        response = self.client.post("/auth/registration/", {
+            "username": "newbie", "email": "newbie@example.com",
+            "password1": "Secret123!", "password2": "Secret123!",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(username="newbie").check_password("Secret123!"))
+        self.assertEqual(hashing.pool.stats()["completed"], 1)
+
+    @override_settings(PASSWORD_HASHING={"MAX_QUEUE": 0})
+    def test_full_pool_answers_503(self):
+        response = self.client.post("/auth/login/", {"username": "hasher", "password": "hashpass"}, format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+        response = self.client.post("/auth/registration/", {
+            "username": "busy", "email": "busy@example.com",
+            "password1": "Secret123!", "password2": "Secret123!",
+        }, format="json")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(User.objects.filter(username="busy").exists())
+        self.assertEqual(hashing.pool.stats()["rejected"], 2)
+
+    @override_settings(PASSWORD_HASHING={"MAX_QUEUE": 0})
+    def test_full_pool_fails_plain_authenticate(self):
+        # e.g. the admin login form: a failed login, not an error
+        self.assertIsNone(authenticate(username="hasher", password="hashpass"))
+
+
+class ProvisionUsersTestCase(APITestCase):
+    def test_provision_users(self):
+        User.objects.create_user(username="existing", password="x")
+        rows = [
+            {"username": "alice", "email": "alice@example.com", "password": "alicepass"},
+            {"username": "bob", "email": "bob@example.com", "password": "bobpass"},
+            {"username": "existing", "email": "", "password": "other"},
+            {"username": "carol", "email": ""},
+        ]
+        with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as source:
+            source.write("\n".join(json.dumps(row) for row in rows))
+        self.addCleanup(os.remove, source.name)
+
+        out = StringIO()
+        call_command("provision_users", source.name, "--batch-size", "1", "--workers", "2", stdout=out, stderr=StringIO())
+        self.assertIn("Created 2 users (2 skipped)", out.getvalue())
+        self.assertTrue(User.objects.get(username="alice").check_password("alicepass"))
+        self.assertTrue(User.objects.get(username="bob").check_password("bobpass"))
+        self.assertTrue(User.objects.get(username="existing").check_password("x"))
+        self.assertEqual(UserProfile.objects.filter(user__username__in=["alice", "bob"]).count(), 2)
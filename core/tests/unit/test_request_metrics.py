@@ -0,0 +1,56 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.metrics import RequestMetricsMiddleware, fingerprint
+from core.models import Task
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@override_settings(REQUEST_METRICS={'ENABLED': True, 'SLOW_REQUEST_MS': 0, 'REPEATED_QUERY_THRESHOLD': 2})
+class RequestMetricsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='metered', password='meteredpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+        Task.objects.create(title="Measured", description="desc", status="Not Started", priority="Low")
+
+    def test_server_timing_and_logs(self):
+        with self.assertLogs('core.metrics', level='INFO') as logs:
+            response = self.client.get("/api/tasks/")
+
+        self.assertEqual(response.status_code, 200)
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;desc="\d+ queries";dur=[\d.]+')
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn('total;dur=', timing)
+        self.assertTrue(any('"path": "/api/tasks/"' in line for line in logs.output))
+        self.assertTrue(any('slow request' in line for line in logs.output))
+
+    def test_repeated_queries_are_reported(self):
+        def n_plus_one(request):
+            for task in Task.objects.all():
+                list(Task.objects.filter(pk=task.pk))
+                list(Task.objects.filter(pk=task.pk + 1))
+            return HttpResponse()
+
+        with self.assertLogs('core.metrics', level='WARNING') as logs:
+            RequestMetricsMiddleware(n_plus_one)(RequestFactory().get('/loop/'))
+
+        repeated = [line for line in logs.output if 'repeated query' in line]
+        self.assertEqual(len(repeated), 1)
+        self.assertIn('"count": 2', repeated[0])
+        self.assertIn("= %s", repeated[0])
+
+    def test_fingerprint_normalizes_literals(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id = 5 AND name = \'x\' AND pk IN (%s, %s,  %s)'),
+            'SELECT * FROM t WHERE id = ? AND name = ? AND pk IN (...)',
+        )
+
+
+class RequestMetricsDisabledTestCase(APITestCase):
+    def test_no_header_when_disabled(self):
+        response = self.client.get("/api/tasks/")
+        self.assertNotIn('Server-Timing', response)
@@ -0,0 +1,35 @@
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class SearchTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='searchpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+        self.invoice = Task.objects.create(title="Send invoice", description="Monthly billing run",
+                                           status="Not Started", priority="High")
+        self.deploy = Task.objects.create(title="Deploy release", description="Roll out the billing fix",
+                                          status="In Progress", priority="Low")
+        Comment.objects.create(task=self.deploy, user=self.user, content="Rollback plan is ready")
+
+    def test_task_search_matches_all_terms(self):
+        response = self.client.get("/api/tasks/search/", {"q": "billing"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({task["id"] for task in response.data["data"]}, {self.invoice.id, self.deploy.id})
+
+        response = self.client.get("/api/tasks/search/", {"q": "billing invoice", "priority": "High"})
+        self.assertEqual([task["id"] for task in response.data["data"]], [self.invoice.id])
+
+    def test_comment_search(self):
+        response = self.client.get("/api/comments/search/", {"q": "rollback"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["data"]), 1)
+
+    def test_search_requires_query(self):
+        response = self.client.get("/api/tasks/search/")
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,81 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskActivityCountersTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='active', password='activepass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+        self.quiet = Task.objects.create(title="Quiet", description="desc", status="Not Started", priority="Low")
+        self.busy = Task.objects.create(title="Busy", description="desc", status="Not Started", priority="Low")
+
+    def test_counters_follow_comment_writes(self):
+        first = Comment.objects.create(task=self.busy, user=self.user, content="one")
+        Comment.objects.create(task=self.busy, user=self.user, content="two")
+        first.delete()
+
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 1)
+        self.assertGreaterEqual(self.busy.last_activity_at, first.timestamp)
+
+    def test_task_edit_does_not_overwrite_counter(self):
+        stale = Task.objects.get(pk=self.busy.pk)
+        Comment.objects.create(task=self.busy, user=self.user, content="one")
+        stale.title = "Renamed"
+        stale.save()
+
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 1)
+
+    def test_edits_are_not_activity(self):
+        comment = Comment.objects.create(task=self.busy, user=self.user, content="one")
+        self.client.patch(f"/api/tasks/{self.busy.id}/", {"title": "Renamed"}, format="json")
+        self.client.patch("/api/tasks/bulk/", [{"id": self.busy.id, "title": "Again"}], format="json")
+
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.title, "Again")
+        self.assertEqual(self.busy.last_activity_at, comment.timestamp)
+        # So the repair agrees with the live maintenance
+        Task.objects.filter(pk=self.busy.pk).refresh_activity()
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.last_activity_at, comment.timestamp)
+
+    def test_order_by_most_discussed(self):
+        Comment.objects.create(task=self.busy, user=self.user, content="one")
+        response = self.client.get("/api/tasks/", {"ordering": "-comment_count"})
+        self.assertEqual([task["id"] for task in response.data["results"]], [self.busy.id, self.quiet.id])
+
+    def test_repair_command(self):
+        Comment.objects.create(task=self.busy, user=self.user, content="one")
+        Task.objects.update(comment_count=7)
+
+        call_command('repair_task_activity', batch_size=1, stdout=StringIO())
+
+        self.assertEqual(dict(Task.objects.values_list('id', 'comment_count')), {self.quiet.id: 0, self.busy.id: 1})
+
+    def test_repair_lowers_wrong_activity(self):
+        comment = Comment.objects.create(task=self.busy, user=self.user, content="one")
+        Task.objects.update(last_activity_at=timezone.now() + timedelta(days=30))
+
+        call_command('repair_task_activity', stdout=StringIO())
+
+        self.quiet.refresh_from_db()
+        self.busy.refresh_from_db()
+        self.assertEqual(self.quiet.last_activity_at, self.quiet.created_at)
+        self.assertEqual(self.busy.last_activity_at, comment.timestamp)
+
+    def test_bulk_created_tasks_start_inactive(self):
+        response = self.client.post("/api/tasks/bulk/", [
+            {"title": "Bulk", "description": "desc", "status": "Not Started", "priority": "Low"},
+        ], format="json")
+        task = Task.objects.get(pk=response.data["data"]["ids"][0])
+        self.assertEqual(task.last_activity_at, task.created_at)
@@ -0,0 +1,52 @@
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskBulkTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='importer', password='importerpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+    def test_bulk_create_with_assignees(self):
+        items = [
+            {"title": f"Imported {i}", "description": "desc", "status": "Not Started",
+             "priority": "Low", "assigned_users": [self.user.id]}
+            for i in range(5)
+        ]
+        response = self.client.post("/api/tasks/bulk/", items, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["data"]["ids"]), 5)
+        self.assertEqual(self.user.tasks.count(), 5)
+
+    def test_bulk_create_reports_item_errors_and_writes_nothing(self):
+        items = [
+            {"title": "Good", "description": "desc", "status": "Not Started", "priority": "Low"},
+            {"title": "Bad", "description": "desc", "status": "Archived", "priority": "Low"},
+            {"title": "Ghost", "description": "desc", "status": "Not Started", "priority": "Low",
+             "assigned_users": [9999]},
+        ]
+        response = self.client.post("/api/tasks/bulk/", items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_bulk_update_and_delete(self):
+        tasks = [Task.objects.create(title=f"Task {i}", description="desc", status="Not Started", priority="Low")
+                 for i in range(3)]
+
+        response = self.client.patch("/api/tasks/bulk/", [
+            {"id": tasks[0].id, "status": "Completed"},
+            {"id": tasks[1].id, "assigned_users": [self.user.id]},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        tasks[0].refresh_from_db()
+        self.assertEqual(tasks[0].status, "Completed")
+        self.assertEqual(list(tasks[1].assigned_users.all()), [self.user])
+
+        response = self.client.delete("/api/tasks/bulk/", {"ids": [tasks[0].id, tasks[2].id]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Task.objects.values_list('id', flat=True)), [tasks[1].id])
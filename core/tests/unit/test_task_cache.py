@@ -0,0 +1,57 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskResponseCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='cacher', password='cacherpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+        self.task = Task.objects.create(title="Cached", description="desc", status="Not Started", priority="Low")
+        self.url = f"/api/tasks/{self.task.id}/"
+
+    def test_conditional_get_returns_304_without_task_queries(self):
+        response = self.client.get(self.url)
+        etag = response["ETag"]
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse([q for q in context.captured_queries if 'core_task' in q['sql']])
+
+    def test_comment_invalidates_detail_and_list(self):
+        detail_etag = self.client.get(self.url)["ETag"]
+        list_etag = self.client.get("/api/tasks/")["ETag"]
+
+        Comment.objects.create(task=self.task, user=self.user, content="new")
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["comments"]), 1)
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["comment_count"], 1)
+
+    def test_padded_lookup_is_invalidated(self):
+        padded = f"/api/tasks/00{self.task.id}/"
+        etag = self.client.get(padded)["ETag"]
+
+        self.client.patch(self.url, {"title": "Edited"}, format="json")
+
+        response = self.client.get(padded, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["title"], "Edited")
+        self.assertEqual(self.client.get("/api/tasks/abc/").status_code, 404)
+
+    def test_assignment_invalidates_detail(self):
+        self.client.get(self.url)
+        self.user.tasks.add(self.task)
+        response = self.client.get(self.url)
+        self.assertEqual([user["id"] for user in response.data["assigned_users"]], [self.user.id])
@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.models import Task
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskFilterTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='filterer', password='filterpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+        self.todo = Task.objects.create(title="B todo", description="desc", status="Not Started", priority="High")
+        self.doing = Task.objects.create(title="A doing", description="desc", status="In Progress", priority="High")
+        self.done = Task.objects.create(title="C done", description="desc", status="Completed", priority="Low")
+        self.doing.assigned_users.add(self.user)
+
+        Task.objects.filter(pk=self.done.pk).update(created_at=timezone.now() - timedelta(days=10))
+
+    def get_ids(self, params):
+        response = self.client.get("/api/tasks/", params)
+        self.assertEqual(response.status_code, 200)
+        return [task["id"] for task in response.data["results"]]
+
+    def test_filter_by_status_and_priority(self):
+        self.assertEqual(self.get_ids({"status": "Not Started,In Progress", "priority": "High"}),
+                         [self.doing.id, self.todo.id])
+        self.assertEqual(self.get_ids({"priority": "Low"}), [self.done.id])
+
+    def test_filter_by_assignee_and_created_range(self):
+        self.assertEqual(self.get_ids({"assignee": self.user.id}), [self.doing.id])
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.assertEqual(self.get_ids({"created_before": since}), [self.done.id])
+        self.assertNotIn(self.done.id, self.get_ids({"created_after": since}))
+
+    def test_ordering(self):
+        self.assertEqual(self.get_ids({"ordering": "title"}), [self.doing.id, self.todo.id, self.done.id])
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.client.get("/api/tasks/", {"status": "Archived"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.data)
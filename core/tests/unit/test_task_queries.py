@@ -0,0 +1,65 @@
+"""
+Query-count tests for the Task API.
+Listing or reading tasks must cost the same number of queries however many
+tasks, assignees and comments are involved.
+"""
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.authentication import user_cache
+from core.models import Task, Comment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskQueryCountTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='counter', password='counterpass')
+        self.other = User.objects.create_user(username='helper', password='helperpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(title=f"Task {i}", description="desc", status="In Progress", priority="High")
+            task.assigned_users.add(self.user, self.other)
+            Comment.objects.create(task=task, user=self.user, content="first")
+            Comment.objects.create(task=task, user=self.other, content="second")
+
+    def count_queries(self, url):
+        user_cache.clear()  # measure every request with the same authentication cost
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context), response
+
+    def test_list_query_count_is_flat(self):
+        self.create_tasks(2)
+        small, _ = self.count_queries("/api/tasks/")
+
+        self.create_tasks(20)
+        large, response = self.count_queries("/api/tasks/")
+
+        self.assertEqual(small, large)
+        first = response.data["results"][0]
+        self.assertEqual(first["comment_count"], 2)
+        self.assertEqual(first["latest_comment"]["content"], "second")
+        self.assertNotIn("comments", first)
+
+    @override_settings(TASK_DETAIL_COMMENT_WINDOW=5)
+    def test_detail_query_count_is_flat(self):
+        self.create_tasks(1)
+        task = Task.objects.get()
+        small, _ = self.count_queries(f"/api/tasks/{task.id}/")
+
+        for i in range(10):
+            Comment.objects.create(task=task, user=self.other, content=f"extra {i}")
+        large, response = self.count_queries(f"/api/tasks/{task.id}/")
+
+        self.assertEqual(small, large)
+        self.assertEqual(len(response.data["comments"]), 5)
+        self.assertEqual(response.data["comments"][0]["content"], "extra 9")
+        self.assertEqual(len(response.data["assigned_users"]), 2)
@@ -0,0 +1,111 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core import stats
+from core.bulk import bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from core.models import Task, TaskStat
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+class TaskStatsTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='dash', password='dashpass')
+        self.other = User.objects.create_user(username='board', password='boardpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+
+    def assertConsistent(self):
+        self.assertEqual(stats.check(), {})
+
+    def test_counts_follow_task_and_assignment_changes(self):
+        task = Task.objects.create(title="One", description="desc", status="Not Started", priority="Low")
+        task.assigned_users.add(self.user, self.other)
+        self.assertConsistent()
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = "Completed"
+        task.save()
+        self.assertConsistent()
+
+        task.assigned_users.remove(self.other, self.other.pk + 100)
+        self.user.tasks.clear()
+        self.assertConsistent()
+
+        task.assigned_users.add(self.user)
+        task.delete()
+        self.assertConsistent()
+        self.assertFalse(TaskStat.objects.exclude(count=0).exists())
+
+    def test_saves_of_stale_instances_keep_counts(self):
+        task = Task.objects.create(title="One", description="desc", status="Not Started", priority="Low")
+        task.assigned_users.add(self.user)
+        first, second = Task.objects.get(pk=task.pk), Task.objects.get(pk=task.pk)
+        first.status = "In Progress"
+        first.save()
+        # Loaded before the first save, so it still holds "Not Started"
+        second.status = "Completed"
+        second.save()
+        self.assertConsistent()
+
+    def test_bulk_writes_keep_counts(self):
+        ids = bulk_create_tasks([
+            {"title": "A", "description": "d", "status": "Not Started", "priority": "High",
+             "assigned_users": [self.user.id]},
+            {"title": "B", "description": "d", "status": "In Progress", "priority": "High"},
+        ])
+        self.assertConsistent()
+
+        bulk_update_tasks([{"id": ids[0], "status": "Completed", "assigned_users": [self.other.id]}])
+        self.assertConsistent()
+
+        bulk_delete_tasks(ids)
+        self.assertConsistent()
+
+    def test_deltas_are_applied_in_lock_order(self):
+        deltas = {
+            ("Not Started", "Low", self.other.id): 1,
+            ("Completed", "High", self.user.id): 1,
+            ("Not Started", "Low", None): 1,
+            ("Completed", "High", None): -1,
+            ("Not Started", "Low", self.user.id): 1,
+        }
+        with mock.patch.object(TaskStat.objects, 'filter', wraps=TaskStat.objects.filter) as filter:
+            stats.apply_deltas(deltas)
+        keys = [(call.kwargs['status'], call.kwargs['priority'], call.kwargs['user_id']) for call in filter.call_args_list]
+        self.assertEqual(keys, [
+            ("Completed", "High", None),
+            ("Completed", "High", self.user.id),
+            ("Not Started", "Low", None),
+            ("Not Started", "Low", self.user.id),
+            ("Not Started", "Low", self.other.id),
+        ])
+
+    def test_stats_endpoint(self):
+        task = Task.objects.create(title="Mine", description="desc", status="In Progress", priority="High")
+        task.assigned_users.add(self.user)
+        Task.objects.create(title="Other", description="desc", status="Completed", priority="Low")
+
+        data = self.client.get("/api/tasks/stats/").data["data"]
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(data["by_status"]["Completed"], 1)
+        self.assertEqual(data["by_status_and_priority"]["In Progress"]["High"], 1)
+
+        mine = self.client.get("/api/tasks/stats/", {"user": "me"}).data["data"]
+        self.assertEqual(mine["total"], 1)
+        self.assertEqual(mine["by_priority"], {"Low": 0, "Medium": 0, "High": 1})
+
+        self.assertEqual(self.client.get("/api/tasks/stats/", {"user": "x"}).status_code, 400)
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(title="One", description="desc", status="Not Started", priority="Low")
+        TaskStat.objects.update(count=5)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_stats', check=True, stdout=StringIO())
+        call_command('rebuild_task_stats', stdout=StringIO())
+        call_command('rebuild_task_stats', check=True, stdout=StringIO())
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+from django.contrib.auth.models import User
+from core.bulk import bulk_update_tasks
+from core.models import Task, Comment, Tombstone
+from core.sync import encode_token
+from rest_framework_simplejwt.tokens import RefreshToken
+
+
+@override_settings(TASK_CHANGES_LAG_SECONDS=0, TASK_CHANGES_MAX_WRITE_SECONDS=60)
+class TaskSyncTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='syncer', password='syncerpass')
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {str(refresh.access_token)}')
+        self.kept = Task.objects.create(title="Kept", description="desc", status="Not Started", priority="Low")
+        self.dropped = Task.objects.create(title="Dropped", description="desc", status="Not Started", priority="Low")
+        self.comment = Comment.objects.create(task=self.kept, user=self.user, content="hello")
+
+    def sync(self, since='', **params):
+        response = self.client.get("/api/tasks/changes/", {"since": since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data["data"]
+
+    def test_initial_sync_returns_everything(self):
+        data = self.sync()
+        self.assertEqual({task["id"] for task in data["tasks"]}, {self.kept.id, self.dropped.id})
+        self.assertEqual([comment["id"] for comment in data["comments"]], [self.comment.id])
+        self.assertFalse(data["has_more"])
+
+    def test_only_changes_since_token_are_returned(self):
+        token = self.sync()["next"]
+        self.assertEqual(self.sync(token)["tasks"], [])
+
+        self.kept.title = "Renamed"
+        self.kept.save()
+        dropped_id = self.dropped.id
+        self.dropped.delete()
+        data = self.sync(token)
+
+        self.assertEqual([task["title"] for task in data["tasks"]], ["Renamed"])
+        self.assertEqual(data["comments"], [])
+        self.assertEqual(data["deleted"], {"tasks": [dropped_id], "comments": []})
+
+    def test_comments_assignees_and_bulk_updates_count_as_changes(self):
+        token = self.sync()["next"]
+        Comment.objects.create(task=self.dropped, user=self.user, content="new")
+        self.assertEqual([task["id"] for task in self.sync(token)["tasks"]], [self.dropped.id])
+
+        token = self.sync(token)["next"]
+        self.kept.assigned_users.add(self.user)
+        self.assertEqual([task["id"] for task in self.sync(token)["tasks"]], [self.kept.id])
+
+        token = self.sync(token)["next"]
+        bulk_update_tasks([{"id": self.dropped.id, "status": "Completed"}])
+        self.assertEqual([task["status"] for task in self.sync(token)["tasks"]], ["Completed"])
+
+    @override_settings(TASK_CHANGES_MAX_WRITE_SECONDS=0)
+    def test_slow_bulk_write_is_rolled_back(self):
+        response = self.client.patch("/api/tasks/bulk/", [{"id": self.kept.id, "title": "Late"}], format="json")
+        self.assertEqual(response.status_code, 503)
+        self.kept.refresh_from_db()
+        self.assertEqual(self.kept.title, "Kept")
+
+    def test_limit_pages_through_changes(self):
+        data = self.sync(limit=1)
+        self.assertTrue(data["has_more"])
+        data = self.sync(data["next"], limit=1)
+        self.assertEqual(len(data["tasks"]), 1)
+        self.assertFalse(data["has_more"])
+
+    def test_invalid_token(self):
+        response = self.client.get("/api/tasks/changes/", {"since": "not-a-token"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_expired_token_requires_full_resync(self):
+        token = self.sync()["next"]
+        with override_settings(TASK_CHANGES_TOMBSTONE_DAYS=0):
+            response = self.client.get("/api/tasks/changes/", {"since": token})
+        self.assertEqual(response.status_code, 410)
+        self.assertTrue(response.data["resync"])
+
+        # Tokens that do not record which deletions they have seen
+        legacy = encode_token({"tasks": [timezone.now().isoformat(), self.kept.id]})
+        self.assertEqual(self.client.get("/api/tasks/changes/", {"since": legacy}).status_code, 410)
+
+        # A full resync hands out a fresh token
+        self.assertEqual(self.sync(self.sync()["next"])["tasks"], [])
+
+    def test_paging_through_old_tombstones_does_not_expire(self):
+        Tombstone.objects.bulk_create([
+            Tombstone(model=Tombstone.TASK, object_id=1000 + i, deleted_at=timezone.now() - timedelta(days=40))
+            for i in range(2)
+        ])
+        data = self.sync(limit=1)
+        self.assertTrue(data["has_more"])
+        data = self.sync(data["next"], limit=1)
+        self.assertEqual(data["deleted"]["tasks"], [1001])
+
+    def test_prune_tombstones(self):
+        dropped_id = self.dropped.id
+        self.dropped.delete()
+        Tombstone.objects.create(model=Tombstone.COMMENT, object_id=1, deleted_at=timezone.now() - timedelta(days=31))
+        out = StringIO()
+        call_command("prune_tombstones", stdout=out)
+        self.assertIn("Pruned 1 tombstones", out.getvalue())
+        self.assertEqual(list(Tombstone.objects.values_list("object_id", flat=True)), [dropped_id])
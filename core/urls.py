@@ -1,8 +1,16 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
+from .async_views import AsyncTaskListView, AsyncTaskDetailView, AsyncCommentListView, AsyncCommentDetailView
 from .views import TaskViewSet, CommentViewSet
 
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
 router.register(r'comments', CommentViewSet)
 
-urlpatterns = router.urls
\ No newline at end of file
+urlpatterns = router.urls + [
+    # Native async list, retrieve and create (see core/async_views.py)
+    path('async/tasks/', AsyncTaskListView.as_view(), name='async-task-list'),
+    path('async/tasks/<str:pk>/', AsyncTaskDetailView.as_view(), name='async-task-detail'),
+    path('async/comments/', AsyncCommentListView.as_view(), name='async-comment-list'),
+    path('async/comments/<str:pk>/', AsyncCommentDetailView.as_view(), name='async-comment-detail'),
+]
@@ -1,38 +1,104 @@
-import requests
+import json
 
-from django.conf import settings
-from django.contrib.auth.models import User
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User, update_last_login
+from django.db.models import Prefetch
+from django.http import JsonResponse, QueryDict
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 
-from rest_framework import generics, status, viewsets
-from rest_framework.decorators import api_view
+from rest_framework import serializers, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.views import TokenObtainPairView
 
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from dj_rest_auth.registration.views import SocialLoginView
 
 from .models import Task, Comment
+from . import caching, github, stats
+from .authentication import PooledModelBackend
+from .hashing import HashingPoolFull
+from .bulk import BulkValidationError, bulk_create_tasks, bulk_update_tasks, bulk_delete_tasks
+from .export import (
+    EXPORT_FORMATS, TASK_FIELDS, COMMENT_FIELDS,
+    task_export_queryset, task_row, comment_export_queryset, comment_row, streaming_export,
+)
+from .filters import TaskFilterBackend, CommentFilterBackend, TaskOrderingFilter
+from .pagination import TaskCursorPagination, CommentCursorPagination
+from .search import search_tasks, search_comments
+from .sync import ExpiredToken, InvalidToken, WriteTooSlow, changes_since
 from .serializers import (
     TaskSerializer,
+    TaskListSerializer,
     CommentSerializer,
     RegisterSerializer,
     MyTokenObtainPairSerializer,
+    comment_window,
 )
 
-GITHUB_CLIENT_ID = settings.GITHUB_CLIENT_ID
-GITHUB_CLIENT_SECRET = settings.GITHUB_CLIENT_SECRET
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+CHANGES_DEFAULT_LIMIT = 200
+CHANGES_MAX_LIMIT = 1000
+
+
+def search_response(viewset, search):
+    """
+    Run a ranked full-text search for the ``q`` query parameter and return
+    at most ``limit`` results (best match first).
+    """
+    text = viewset.request.query_params.get('q', '').strip()
+    if not text:
+        return Response({'error': 'Query parameter q is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    limit = viewset.request.query_params.get('limit', '')
+    limit = min(int(limit), SEARCH_MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else SEARCH_DEFAULT_LIMIT
+
+    results = search(viewset.filter_queryset(viewset.get_queryset()), text)[:limit]
+    serializer = viewset.get_serializer(results, many=True)
+    return Response({'message': 'Search results', 'data': serializer.data})
+
 
-@api_view(['POST'])
-def github_auth(request):
+def export_response(viewset, queryset, make_row, columns, filename):
+    """
+    Stream the filtered queryset as NDJSON (default) or CSV, chosen with
+    the ``output`` query parameter.
+    """
+    export_format = viewset.request.query_params.get('output', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return Response(
+            {'error': f"Unsupported output format, expected one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    queryset = viewset.filter_queryset(queryset)
+    return streaming_export(viewset.request, queryset, make_row, columns, export_format, filename)
+
+def request_data(request):
+    """The JSON or form body of a plain Django view's request, or None if it isn't an object."""
+    if request.content_type == 'application/json':
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return None
+    else:
+        data = request.POST
+    return data if isinstance(data, (dict, QueryDict)) else None
+
+
+@csrf_exempt
+@require_POST
+async def github_auth(request):
     """
         Handle GitHub OAuth authentication.
 
-        Expects a 'code' in the POST request data, which is the authorization code
-        obtained from GitHub OAuth flow.
+        Expects a 'code' in the POST request data (JSON or form encoded), which is
+        the authorization code obtained from GitHub OAuth flow.
 
         Steps:
         1. Exchange the authorization code for an access token from GitHub.
@@ -40,53 +106,40 @@ def github_auth(request):
         3. Get or create a Django User corresponding to the GitHub user.
         4. Issue JWT refresh and access tokens for the user.
 
+        The GitHub calls run off the event loop on a pooled HTTP session with
+        connect/read timeouts (see core/github.py).
+
         Returns:
             200 OK with JWT tokens and user info on success,
-            400 Bad Request with error message on failure.
+            400 Bad Request with error message on failure,
+            502/504 when GitHub is unavailable or too slow.
 
         # Note: This GitHub OAuth authentication does NOT return the user's GitHub password.
         # You should send a separate set-password or password-reset link to the user
         # if you want them to be able to log in with username/password in your system.
     """
-    code = request.data.get('code')
+    data = request_data(request)
+    code = data.get('code') if data is not None else None
     if not code:
-        return Response({'error': 'Code not provided'}, status=status.HTTP_400_BAD_REQUEST)
-
-    # Exchange authorization code for access token from GitHub
-    token_url = 'https://github.com/login/oauth/access_token'
-    token_data = {
-        'client_id': GITHUB_CLIENT_ID,
-        'client_secret': GITHUB_CLIENT_SECRET,
-        'code': code,
-    }
-    headers = {'Accept': 'application/json'}
-    token_response = requests.post(token_url, data=token_data, headers=headers)
-    token_json = token_response.json()
-    access_token = token_json.get('access_token')
-
-    if not access_token:
-        return Response({'error': 'Failed to get access token'}, status=status.HTTP_400_BAD_REQUEST)
-
-    # Retrieve user info from GitHub API using access token
-    user_url = 'https://api.github.com/user'
-    user_headers = {'Authorization': f'token {access_token}'}
-    user_response = requests.get(user_url, headers=user_headers)
-    user_data = user_response.json()
-
-    if 'id' not in user_data:
-        return Response({'error': 'Failed to fetch user info'}, status=status.HTTP_400_BAD_REQUEST)
+        return JsonResponse({'error': 'Code not provided'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        access_token = await github.aexchange_code(code)
+        user_data = await github.afetch_profile(access_token)
+    except github.GitHubError as exc:
+        return JsonResponse({'error': str(exc)}, status=exc.status)
 
     # Use GitHub login as username and email if available
     username = user_data.get('login')
     email = user_data.get('email') or f'{username}@github.com'  # fallback email if GitHub email is private
 
     # Get or create the user in the Django database
-    user, created = User.objects.get_or_create(username=username, defaults={'email': email})
+    user, created = await User.objects.aget_or_create(username=username, defaults={'email': email})
 
     # Generate JWT refresh and access tokens for the user
     refresh = RefreshToken.for_user(user)
 
-    return Response({
+    return JsonResponse({
         'refresh': str(refresh),
         'access': str(refresh.access_token),
         'user': {
@@ -96,42 +149,92 @@ def github_auth(request):
     })
 
 
-class RegisterView(generics.CreateAPIView):
+def hashing_busy_response():
+    """503 answered when the password hashing pool is saturated."""
+    return JsonResponse(
+        {'error': 'Too many sign-ins in progress, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'},
+    )
+
+
+@csrf_exempt
+@require_POST
+async def register(request):
     """
     API endpoint for user registration.
 
     Accepts user registration data, validates it using RegisterSerializer,
     creates a new user, and returns JWT refresh and access tokens
     along with user information on successful registration.
+
+    Async so that waiting for the hashing pool holds no thread (see
+    core/hashing.py).
     """
-    serializer_class = RegisterSerializer
+    serializer = RegisterSerializer(data=request_data(request))
+    # The username uniqueness check queries the database
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        user = await serializer.acreate(serializer.validated_data)
+    except HashingPoolFull:
+        return hashing_busy_response()
+
+    # Generate JWT tokens upon successful registration
+    refresh = RefreshToken.for_user(user)
 
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        user = serializer.save()
+    return JsonResponse({
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+        'user': {
+            'username': user.username,
+            'email': user.email,
+        }
+    }, status=status.HTTP_201_CREATED)
 
-        # Generate JWT tokens upon successful registration
-        refresh = RefreshToken.for_user(user)
 
-        return Response({
-            'refresh': str(refresh),
-            'access': str(refresh.access_token),
-            'user': {
-                'username': user.username,
-                'email': user.email,
-            }
-        }, status=status.HTTP_201_CREATED)
+@csrf_exempt
+@require_POST
+async def obtain_token_pair(request):
+    """
+    Obtain a JWT token pair (access and refresh) for a username and password.
 
+    Responds like MyTokenObtainPairSerializer: the tokens plus a success
+    message and user info; 503 when the hashing pool is saturated.
 
-class MyTokenObtainPairView(TokenObtainPairView):
+    Async like ``register``. Credentials are checked with
+    ``PooledModelBackend.acheck_credentials`` rather than ``aauthenticate()``,
+    which turns a saturated pool into a failed login instead of a 503.
     """
-    Custom view to obtain JWT token pair (access and refresh).
+    serializer = MyTokenObtainPairSerializer(context={'request': request})
+    try:
+        # Field validation only; validate() would authenticate synchronously
+        credentials = serializer.to_internal_value(request_data(request))
+    except serializers.ValidationError as exc:
+        return JsonResponse(exc.detail, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        user = await PooledModelBackend().acheck_credentials(
+            credentials[serializer.username_field], credentials['password']
+        )
+    except HashingPoolFull:
+        return hashing_busy_response()
+    if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+        return JsonResponse(
+            {'detail': serializer.error_messages['no_active_account']},
+            status=status.HTTP_401_UNAUTHORIZED,
+            headers={'WWW-Authenticate': JWTAuthentication().authenticate_header(request)},
+        )
+
+    refresh = serializer.get_token(user)
+    if jwt_settings.UPDATE_LAST_LOGIN:
+        await sync_to_async(update_last_login)(None, user)
+    return JsonResponse({
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+        **serializer.login_details(user),
+    })
 
-    Uses a custom serializer (MyTokenObtainPairSerializer) to validate
-    user credentials and issue JWT tokens.
-    """
-    serializer_class = MyTokenObtainPairSerializer
 
 class GoogleLogin(SocialLoginView):
     adapter_class = GoogleOAuth2Adapter
@@ -145,6 +248,61 @@ class TaskViewSet(viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TaskCursorPagination
+    filter_backends = [TaskFilterBackend, TaskOrderingFilter]
+    ordering_fields = ['created_at', 'title', 'comment_count', 'last_activity_at']
+
+    def get_queryset(self):
+        """
+        Load assigned users and comments with a fixed number of queries.
+
+        List responses only need the latest comment (the count is stored on
+        the task) and single-task responses a bounded window of recent ones;
+        the full thread is paginated by the ``comments`` action.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'comments':
+            return queryset
+        assignees = User.objects.select_related('userprofile')
+        queryset = queryset.prefetch_related(Prefetch('assigned_users', queryset=assignees))
+        if self.action in ('list', 'search', 'changes'):
+            latest_comments = Comment.objects.select_related('user__userprofile').order_by('-timestamp', '-id')[:1]
+            return queryset.prefetch_related(
+                Prefetch('comments', queryset=latest_comments, to_attr='latest_comments')
+            )
+        recent_comments = (
+            Comment.objects.select_related('user__userprofile').order_by('-timestamp', '-id')[:comment_window()]
+        )
+        return queryset.prefetch_related(
+            Prefetch('comments', queryset=recent_comments, to_attr='recent_comments')
+        )
+
+    def get_serializer_class(self):
+        if self.action in ('list', 'search', 'changes'):
+            return TaskListSerializer
+        return super().get_serializer_class()
+
+    def list(self, request, *args, **kwargs):
+        """
+        List tasks, served from the versioned response cache when possible.
+        """
+        return caching.cached_response(
+            request, caching.list_entry(request),
+            lambda: super(TaskViewSet, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Retrieve a task, served from the versioned response cache when possible.
+        """
+        task_id = caching.lookup_task_id(kwargs[self.lookup_field])
+        if task_id is None:
+            # Not a task id: answer the 404 without caching anything
+            return super().retrieve(request, *args, **kwargs)
+        return caching.cached_response(
+            request, caching.detail_entry(task_id),
+            lambda: super(TaskViewSet, self).retrieve(request, *args, **kwargs),
+        )
 
     def create(self, request, *args, **kwargs):
         """
@@ -176,14 +334,129 @@ class TaskViewSet(viewsets.ModelViewSet):
             status=status.HTTP_204_NO_CONTENT
         )
 
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over task titles and descriptions, ranked by relevance.
+        """
+        return search_response(self, search_tasks)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Task counts by status and priority, read from the incrementally
+        maintained TaskStat table. Pass ``user=<id>`` (or ``user=me``) for the
+        counts of the tasks assigned to that user.
+        """
+        user = request.query_params.get('user')
+        if user == 'me':
+            user = str(request.user.pk)
+        if user is not None and not user.isdigit():
+            return Response({'error': 'user must be a user id or "me"'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'message': 'Task statistics',
+            'data': stats.summary(int(user) if user else None),
+        })
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Return the tasks and comments created or updated, and the ids of those
+        deleted, since the ``since`` token of a previous sync (omit it for a
+        full initial sync).
+
+        Store ``data.next`` and pass it as ``since`` next time; while
+        ``data.has_more`` is true, sync again right away. At most ``limit``
+        records of each kind are returned per call. A token older than the
+        tombstone retention is answered with 410 and ``resync``: drop the
+        local copy and sync again without ``since``.
+        """
+        limit = request.query_params.get('limit', '')
+        limit = min(int(limit), CHANGES_MAX_LIMIT) if limit.isdigit() and int(limit) > 0 else CHANGES_DEFAULT_LIMIT
+        try:
+            changes, token, has_more = changes_since(
+                request.query_params.get('since', ''), limit, self.get_queryset(),
+                Comment.objects.select_related('user__userprofile'),
+            )
+        except InvalidToken:
+            return Response({'error': 'Invalid since token'}, status=status.HTTP_400_BAD_REQUEST)
+        except ExpiredToken:
+            return Response(
+                {'error': 'Since token expired, full resync required', 'resync': True}, status=status.HTTP_410_GONE
+            )
+
+        deleted = {'tasks': [], 'comments': []}
+        for tombstone in changes['deleted']:
+            deleted['tasks' if tombstone.model == tombstone.TASK else 'comments'].append(tombstone.object_id)
+        return Response({'message': 'Changes since token', 'data': {
+            'tasks': self.get_serializer(changes['tasks'], many=True).data,
+            'comments': CommentSerializer(changes['comments'], many=True).data,
+            'deleted': deleted,
+            'next': token,
+            'has_more': has_more,
+        }})
+
+    @action(detail=True, methods=['get'])
+    def comments(self, request, pk=None):
+        """
+        List the task's comments, newest first, with keyset pagination.
+        """
+        task = self.get_object()
+        paginator = CommentCursorPagination()
+        # Without the view, so the task ordering parameter doesn't apply to comments
+        page = paginator.paginate_queryset(task.comments.select_related('user__userprofile'), request)
+        serializer = CommentSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all tasks matching the list filters as NDJSON or CSV.
+        """
+        queryset = task_export_queryset(Task.objects.all())
+        return export_response(self, queryset, task_row, TASK_FIELDS + ['assigned_users'], 'tasks')
+
+    @action(detail=False, methods=['post', 'patch', 'delete'])
+    def bulk(self, request):
+        """
+        Create (POST), partially update (PATCH) or delete (DELETE) many tasks
+        in a single transaction.
+
+        POST and PATCH take a list of task objects (PATCH items need an id),
+        DELETE takes {"ids": [...]}. Nothing is written if any item is
+        invalid; the response then lists the errors by item index.
+        """
+        try:
+            if request.method == 'POST':
+                task_ids = bulk_create_tasks(request.data)
+                message, code = "Tasks are successfully created", status.HTTP_201_CREATED
+            elif request.method == 'PATCH':
+                task_ids = bulk_update_tasks(request.data)
+                message, code = "Tasks are successfully updated", status.HTTP_200_OK
+            else:
+                ids = request.data.get('ids') if isinstance(request.data, dict) else None
+                task_ids = bulk_delete_tasks(ids)
+                message, code = "Tasks are successfully deleted", status.HTTP_200_OK
+        except BulkValidationError as exc:
+            return Response({"errors": exc.errors}, status=status.HTTP_400_BAD_REQUEST)
+        except WriteTooSlow:
+            return Response(
+                {"error": "The batch took too long to write; retry with fewer items"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+
+        return Response({"message": message, "data": {"ids": task_ids}}, status=code)
+
 
 class CommentViewSet(viewsets.ModelViewSet):
     """
     ViewSet for managing Comment CRUD operations with custom response messages.
     """
-    queryset = Comment.objects.all()
+    queryset = Comment.objects.select_related('user__userprofile')
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = CommentCursorPagination
+    filter_backends = [CommentFilterBackend]
 
     def perform_create(self, serializer):
         """
@@ -220,3 +493,18 @@ class CommentViewSet(viewsets.ModelViewSet):
             {"message": "Comment is successfully deleted"},
             status=status.HTTP_204_NO_CONTENT
         )
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over comment content, ranked by relevance.
+        """
+        return search_response(self, search_comments)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all comments matching the filters as NDJSON or CSV.
+        """
+        queryset = comment_export_queryset(Comment.objects.all())
+        return export_response(self, queryset, comment_row, COMMENT_FIELDS, 'comments')
@@ -21,6 +21,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 
     'rest_framework',
     'rest_framework.authtoken',
@@ -43,12 +44,15 @@ SITE_ID = 1
 # Middleware
 # ----------------------------------------------------------------
 MIDDLEWARE = [
+    # Outermost so its timings cover the whole stack; inactive unless REQUEST_METRICS is enabled
+    'core.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'social_django.middleware.SocialAuthExceptionMiddleware',
+    # Async-capable wrapper, so the stack stays async for the views in core/async_views.py
+    'core.middleware.SocialAuthExceptionMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -60,8 +64,10 @@ ROOT_URLCONF = 'taskmanager.urls'
 # Authentication Backends
 # ----------------------------------------------------------------
 AUTHENTICATION_BACKENDS = (
-    'django.contrib.auth.backends.ModelBackend',
-    'allauth.account.auth_backends.AuthenticationBackend',
+    # ModelBackend verifying passwords on the bounded hashing pool. Not
+    # allauth's backend: logins are by username only (ACCOUNT_AUTHENTICATION_METHOD),
+    # and it would verify the failed ones again with a hash on the request thread.
+    'core.authentication.PooledModelBackend',
     'social_core.backends.github.GithubOAuth2', 
 )
 
@@ -111,6 +117,18 @@ DATABASES = {
     }
 }
 
+# ----------------------------------------------------------------
+# Cache
+# ----------------------------------------------------------------
+# Shared by every worker process: the response cache versions and the
+# WebSocket event log (core/eventlog.py) must agree across processes
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://127.0.0.1:6379/1',
+    }
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'dj_rest_auth.jwt_auth.JWTCookieAuthentication',  # or
@@ -122,10 +140,28 @@ REST_FRAMEWORK = {
 # ----------------------------------------------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'dj_rest_auth.jwt_auth.JWTCookieAuthentication',
+        # JWTCookieAuthentication with an in-process cache of the token's user
+        'core.authentication.CachedJWTCookieAuthentication',
     ),
 }
 
+REQUEST_METRICS = {
+    'ENABLED': os.getenv('REQUEST_METRICS') == '1',
+    'SLOW_REQUEST_MS': 500,
+    'REPEATED_QUERY_THRESHOLD': 5,
+}
+
+PASSWORD_HASHING = {
+    'WORKERS': 4,
+    'MAX_QUEUE': 64,
+    'TIMEOUT': 10,  # seconds
+}
+
+JWT_USER_CACHE = {
+    'MAX_SIZE': 1024,
+    'TTL': 30,  # seconds
+}
+
 REST_AUTH_SERIALIZERS = {
     'TOKEN_SERIALIZER': 'dj_rest_auth.serializers.JWTSerializer',
 }
@@ -160,9 +196,27 @@ ACCOUNT_EMAIL_REQUIRED = True
 # ----------------------------------------------------------------
 STATIC_URL = 'static/'
 
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Resized avatar variants rendered in the background (see core/avatars.py)
+AVATAR_VARIANTS = {
+    'SIZES': {'small': 32, 'medium': 64, 'large': 128},
+    'FORMATS': ['webp', 'jpeg'],
+    'WORKERS': 2,
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 GITHUB_CLIENT_ID = os.getenv('GITHUB_CLIENT_ID')
 GITHUB_CLIENT_SECRET = os.getenv('GITHUB_CLIENT_SECRET')
 
+# Pooled HTTP client used by the GitHub OAuth exchange (see core/github.py)
+GITHUB_HTTP = {
+    'CONNECT_TIMEOUT': 3.05,
+    'READ_TIMEOUT': 10,
+    'POOL_SIZE': 10,
+    'PROFILE_CACHE_TIMEOUT': 60,
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
\ No newline at end of file
@@ -1,15 +1,17 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include
-from core.views import GoogleLogin, github_auth, RegisterView, MyTokenObtainPairView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from core.views import GoogleLogin, github_auth, register, obtain_token_pair
+from rest_framework_simplejwt.views import TokenRefreshView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),  # your app api
 
     # REST auth routes
-    path('auth/registration/', RegisterView.as_view(), name='auth_registration'),
-    path('auth/login/', MyTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('auth/registration/', register, name='auth_registration'),
+    path('auth/login/', obtain_token_pair, name='token_obtain_pair'),
     # path('auth/', include('dj_rest_auth.urls')),
     # path('auth/registration/', include('dj_rest_auth.registration.urls')),
 
@@ -18,6 +20,9 @@ urlpatterns = [
     path('auth/github/', github_auth, name='github_auth'),
 
     # JWT token endpoints (optional, can be used separately)
-    path('auth/jwt/create/', TokenObtainPairView.as_view(), name='jwt_create'),
+    path('auth/jwt/create/', obtain_token_pair, name='jwt_create'),
     path('auth/jwt/refresh/', TokenRefreshView.as_view(), name='jwt_refresh'),
 ]
+
+# Uploaded avatars and their variants; served by the web server in production
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)